@@ -20,9 +20,91 @@ CLI ARGUMENTS:
 The program accepts optional arguments to customize behavior:
   --trials: Number of time trials to run (default: 1000)
   --tolerance: Maximum acceptable error from math.pi (default: 0.001)
-  --montecarlo_batch: Number of random samples per Monte Carlo iteration (default: 8)
+  --montecarlo_batch: Number of random samples per Monte Carlo iteration (default: 5)
+  --autotune: Pick the Monte Carlo batch size by timing a short sweep of
+              candidates with the chosen --stopping, --confidence and
+              --max-samples, and cache the winner per host/engine/
+              tolerance and those settings in ~/.pi_autotune.json so
+              later --autotune runs reuse it (--retune forces a fresh
+              sweep)
+  --leibniz-mode: "generator" (default) steps the series term by term;
+                  "closed-form" solves for the stopping index from the
+                  tolerance and sums the series in one pass;
+                  "euler", "aitken" and "averaging" accelerate the
+                  series so tight tolerances need only tens of terms
+  --timing: "per-step" (default) reads the clock on every yielded
+            estimate; "outer" only times the whole run to tolerance;
+            "outer-ns" does the same with time.perf_counter_ns
+  --workers: Number of processes to spread the trials over (default: 1).
+             Each worker gets its own independently seeded RNG stream
+  --seed: Root seed for the worker RNG streams, --mc-batched and
+          --make-pool, so a run can be repeated exactly (default: fresh
+          entropy)
+  --store: JSON-lines file each run's results are appended to
+           (default: pi_trials.jsonl); --no-store turns this off.
+           Trial timings are summarized with streaming statistics, so
+           with --no-store memory use does not grow with --trials
+  --compare: Compare this run against the previous matching run in the
+             store and flag statistically significant slowdowns
+  --engine: Monte Carlo sampling engine, "python" (default), "numpy" or
+            "pool". The NumPy engine draws each batch as arrays, so it
+            pays off with larger batch sizes (e.g. --mc-batch 4096).
+            The pool engine reads pre-generated uniforms from --pool
+  --make-pool: Write --pool-size uniform doubles (default: 50,000,000,
+               i.e. 400 MB, enough for 25,000 points in each of the
+               default 1,000 trials) to this file and exit; --seed makes
+               the pool reproducible
+  --pool: Sample pool file read by --engine pool. It is memory-mapped, so
+          no numbers are generated or copied while timing; every trial
+          (and every worker) reads its own disjoint stretch of the file.
+          Unless --max-samples is given, each run is capped at its share
+          of the pool; a pool too small for the trials is an error
+  --sampler: Point sampler for the Python Monte Carlo engine:
+             "random" (default, pseudo-random), "halton" or "sobol"
+             (low-discrepancy, randomly shifted per trial)
+  --compare-samplers: Also time up to 100 extra Python runs per sampler
+                      and report samples-to-tolerance for every sampler
+                      (slow at tight tolerances)
+  --order: Which method runs first in each trial: "fixed" (default,
+           Leibniz then Monte Carlo), "alternate" (swap every trial)
+           or "random" (coin flip per trial). The results table shows
+           how much running first or second changed each method's time
+  --warmup: Untimed warmup trials run before the measured ones (default: 0)
+  --pin-cpu: Pin the process to this CPU with os.sched_setaffinity
+             (Linux only, single worker)
+  --stopping: When a Monte Carlo run stops. "true-error" (default) compares
+              against math.pi, which a real estimator cannot know;
+              "normal" and "wilson" stop once the confidence interval
+              half-width on pi is within the tolerance ("normal" uses
+              Wilson until there are 10 hits and 10 misses); "sequential"
+              uses an anytime-valid bound that stays honest even though
+              the run checks after every batch. The results report the
+              samples used and how often the estimate really was within
+              the tolerance
+  --confidence: Confidence level for the interval policies (default: 0.95)
+  --max-samples: Cap on Monte Carlo samples per run (default: 20,000,000,
+                 or each run's share of the pool with --engine pool)
+  --mc-batched: Simulate all Monte Carlo trials at once as a NumPy
+                (trials x samples) array and report the distribution of
+                samples needed to reach the tolerance (requires NumPy)
+  --tournament: Instead of Leibniz vs Monte Carlo, race every estimator in
+                the registry (or the ones named by --methods) in each
+                trial and report medians and pairwise win rates
+  --methods: Comma-separated estimator names for --tournament
+             (default: all registered estimators)
+  --digits: High-precision mode. Instead of the float race, compute pi to
+            this many decimal digits (tolerance 10^-digits) with the
+            decimal module, using binary splitting of the Machin and
+            Chudnovsky series, and report digits-per-second throughput
   --profile: cProfile was mentioned in the Professor's Notes.
              Enable cProfile to analyze performance bottlenecks
+  --profiler: "cprofile" (default) or "sampling". The sampling profiler
+              interrupts the program every --profile-interval seconds
+              with SIGPROF and records the call stack, which costs far
+              less than cProfile's per-call hooks (Unix only)
+  --collapsed-out: Write the sampled stacks in collapsed ("folded")
+                   format, ready for flamegraph.pl or speedscope
+  --pstats-out: Save the raw cProfile statistics to a file
 
 USAGE EXAMPLES:
     # Run with defaults (1000 trials, tolerance=0.001)
@@ -34,18 +116,118 @@ USAGE EXAMPLES:
     # Adjust Monte Carlo batch size
     python3 FILENAME.py --montecarlo_batch 50
 
+    # Let the program choose the Monte Carlo batch size for this machine
+    python3 FILENAME.py --autotune
+
     # Enable profiling to see performance statistics
     python3 FILENAME.py --profile
+
+    # Low-overhead sampling profile, written out for a flame graph
+    python3 FILENAME.py --profile --profiler sampling --collapsed-out pi.folded
+
+    # Closed-form Leibniz stopping index at a tight tolerance
+    python3 FILENAME.py --leibniz-mode closed-form --tol 1e-7
+
+    # Accelerated Leibniz series (Euler transform)
+    python3 FILENAME.py --leibniz-mode euler --tol 1e-10
+
+    # Time only the whole convergence, in integer nanoseconds
+    python3 FILENAME.py --timing outer-ns
+
+    # Cancel cache and frequency bias: random order, warmup, one CPU
+    python3 FILENAME.py --order random --warmup 50 --pin-cpu 2
+
+    # Spread 1000 trials over 8 worker processes
+    python3 FILENAME.py --workers 8
+
+    # 10 million trial soak test in constant memory
+    python3 FILENAME.py --trials 10000000 --no-store --workers 32
+
+    # Flag slowdowns against the previous stored run
+    python3 FILENAME.py --compare
+
+    # Quasi-random Monte Carlo points
+    python3 FILENAME.py --sampler sobol --compare-samplers
+
+    # What it costs to reach a guaranteed (not lucky) precision
+    python3 FILENAME.py --stopping wilson --tol 0.01 --engine numpy --mc-batch 4096
+
+    # Samples-to-tolerance distribution for 1000 trials in one array pass
+    python3 FILENAME.py --mc-batched
+
+    # Rank every registered estimator
+    python3 FILENAME.py --tournament --trials 200
+
+    # Race Machin and Chudnovsky to 1,000 digits (tolerance 1e-1000)
+    python3 FILENAME.py --digits 1000 --trials 50
+
+    # Benchmark the estimator without the cost of generating random numbers
+    python3 FILENAME.py --make-pool pool.f64 --seed 1
+    python3 FILENAME.py --engine pool --pool pool.f64 --mc-batch 1024
+
+    # Vectorized Monte Carlo engine (requires NumPy)
+    python3 FILENAME.py --engine numpy --mc-batch 4096
 """
 
 import argparse, cProfile, pstats, random, textwrap, time, statistics as stats, math
+import hashlib, json, mmap, os, platform, signal, subprocess, sys
+from array import array
+from collections import Counter
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from decimal import Decimal, localcontext
 from io import StringIO
 from itertools import count
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for --engine numpy
+    np = None
+
 DEFAULT_TOLERANCE = 0.001
 DEFAULT_TRIALS = 1000
 DEFAULT_MONTECARLO_BATCH = 5
+DEFAULT_ENGINE = "python"
+DEFAULT_LEIBNIZ_MODE = "generator"
+DEFAULT_WORKERS = 1
+DEFAULT_TIMING = "per-step"
+DEFAULT_SAMPLER = "random"
+SAMPLER_COMPARISON_RUNS = 100
+SAMPLER_COMPARISON_MAX_SAMPLES = 1_000_000
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+EXACT_QUANTILE_LIMIT = 5000  # timings kept for exact quantiles; P² beyond
+HISTOGRAM_BUCKETS_PER_DECADE = 100  # ~2.3% wide log-spaced buckets
+DEFAULT_PROFILER = "cprofile"
+DEFAULT_PROFILE_INTERVAL = 0.0005  # seconds of CPU time between samples
+PROFILE_SAMPLING_REPEATS = 200  # single runs are too short to sample well
+DEFAULT_STOPPING = "true-error"
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MAX_SAMPLES = 20_000_000
+DEFAULT_POOL_SIZE = 50_000_000  # doubles, i.e. 25M points (400 MB)
+DEFAULT_ORDER = "fixed"
+TRIAL_ORDERS = ("fixed", "alternate", "random")
+BATCHED_BLOCK_SAMPLES = 4096  # columns simulated per block in --mc-batched
+GUARD_DIGITS = 10  # extra decimal digits carried to absorb rounding
+DEFAULT_STORE = "pi_trials.jsonl"
+REGRESSION_ALPHA = 0.05
+AUTOTUNE_CACHE = os.path.join(os.path.expanduser("~"), ".pi_autotune.json")
+AUTOTUNE_TRIALS = 30
+
+# batch sizes swept by --autotune; the NumPy engine only pays off with
+# large arrays, the pure Python engine with small batches
+AUTOTUNE_CANDIDATES = {
+    "python": (1, 2, 4, 5, 8, 16, 32, 64, 128, 256),
+    "numpy": (16, 64, 256, 1024, 4096, 16384),
+}
+
+# timing mode -> clock read at the start and end of a run
+# ("per-step" also reads perf_counter on every yielded estimate)
+TIMING_CLOCKS = {
+    "per-step": time.perf_counter,
+    "outer": time.perf_counter,
+    "outer-ns": time.perf_counter_ns,
+}
 
 
 # ---------------------------------
@@ -74,7 +256,181 @@ def leibniz_pi_generator():
         denominator += 2.0
 
 
-def monte_carlo_pi_generator(batch_size: int = DEFAULT_MONTECARLO_BATCH):
+# ---------------------------------------------------------------
+# Accelerated Leibniz generators
+# Same (pi_estimate, terms_used) shape as leibniz_pi_generator(),
+# where terms_used counts the Leibniz terms consumed so far
+# ---------------------------------------------------------------
+
+def leibniz_euler_generator():
+    """
+    Yield (pi_estimate, terms_used) using the Euler transform of the
+    Leibniz series, computed term by term with van Wijngaarden's
+    algorithm (the "eulsum" routine from Numerical Recipes).
+    """
+    running_sum = 0.0
+    differences = []  # forward differences of the terms seen so far
+    used = 0          # how many differences have been added to the sum
+    sign = 1.0
+    denominator = 1.0
+
+    for k in count(0):
+        term = sign / denominator
+        if k == 0:
+            differences.append(term)
+            running_sum = 0.5 * term
+            used = 1
+        else:
+            # update the table of averaged differences in place
+            previous = differences[0]
+            differences[0] = term
+            for j in range(used - 1):
+                saved = differences[j + 1]
+                differences[j + 1] = 0.5 * (differences[j] + previous)
+                previous = saved
+            differences.append(0.5 * (differences[used - 1] + previous))
+            if abs(differences[used]) <= abs(differences[used - 1]):
+                running_sum += 0.5 * differences[used]
+                used += 1
+            else:
+                running_sum += differences[used]
+                differences.pop()
+        yield 4.0 * running_sum, k + 1
+
+        sign = -sign
+        denominator += 2.0
+
+
+def leibniz_aitken_generator():
+    """
+    Yield (pi_estimate, terms_used) using iterated Aitken delta-squared
+    extrapolation of the Leibniz partial sums.
+
+    Each level keeps the last three values of the level below and
+    extrapolates s2 - (s2 - s1)² / ((s2 - s1) - (s1 - s0)); the
+    estimate is the value from the deepest level reached so far.
+    """
+    levels = []  # levels[j]: last three values of the j-times accelerated sequence
+    for pi_hat, terms_used in leibniz_pi_generator():
+        value = pi_hat
+        depth = 0
+        while True:
+            if depth == len(levels):
+                levels.append([])
+            window = levels[depth]
+            window.append(value)
+            if len(window) > 3:
+                window.pop(0)
+            if len(window) < 3:
+                break
+            s0, s1, s2 = window
+            denominator = (s2 - s1) - (s1 - s0)
+            if denominator == 0.0:
+                break  # converged to float precision at this level
+            value = s2 - (s2 - s1) ** 2 / denominator
+            depth += 1
+        yield value, terms_used
+
+
+def leibniz_averaging_generator():
+    """
+    Yield (pi_estimate, terms_used) by repeatedly averaging consecutive
+    Leibniz partial sums (a Richardson-style extrapolation).
+
+    Neighbouring partial sums overshoot and undershoot pi by almost the
+    same amount, so their average cancels most of the error; averaging
+    the averages cancels more each level.
+    """
+    previous = []  # previous[j]: last value of the j-times averaged sequence
+    for pi_hat, terms_used in leibniz_pi_generator():
+        value = pi_hat
+        for depth in range(len(previous)):
+            value, previous[depth] = 0.5 * (previous[depth] + value), value
+        previous.append(value)
+        yield value, terms_used
+
+
+# mode name -> Leibniz generator function (selected with --leibniz-mode);
+# "closed-form" is handled separately in run_leibniz()
+LEIBNIZ_GENERATORS = {
+    "generator": leibniz_pi_generator,
+    "euler": leibniz_euler_generator,
+    "aitken": leibniz_aitken_generator,
+    "averaging": leibniz_averaging_generator,
+}
+
+
+# ---------------------------------------------------------------
+# Quasi-random (low-discrepancy) point samplers
+# Infinite generators of (x, y) points in [0,1) x [0,1) that fill
+# the square more evenly than pseudo-random points, so the Monte
+# Carlo error shrinks close to 1/n instead of 1/sqrt(n).
+# Each sampler is randomly shifted so every trial is independent.
+# ---------------------------------------------------------------
+
+def _radical_inverse(index: int, base: int) -> float:
+    """Mirror the base-`base` digits of index around the radix point."""
+    result = 0.0
+    fraction = 1.0 / base
+    while index:
+        index, digit = divmod(index, base)
+        result += digit * fraction
+        fraction /= base
+    return result
+
+
+def halton_points(rng=None):
+    """
+    Yield 2-D Halton points (bases 2 and 3), moved by a random
+    Cranley-Patterson shift: (point + shift) mod 1.
+    """
+    rand = (rng or random).random
+    shift_x, shift_y = rand(), rand()
+    for i in count(1):
+        x = _radical_inverse(i, 2) + shift_x
+        y = _radical_inverse(i, 3) + shift_y
+        yield (x - 1.0 if x >= 1.0 else x), (y - 1.0 if y >= 1.0 else y)
+
+
+SOBOL_BITS = 32
+# direction numbers: dimension 1 is van der Corput in base 2,
+# dimension 2 comes from the primitive polynomial x + 1
+_SOBOL_DIRECTIONS_X = [1 << (SOBOL_BITS - 1 - k) for k in range(SOBOL_BITS)]
+_SOBOL_DIRECTIONS_Y = [1 << (SOBOL_BITS - 1)]
+for _ in range(SOBOL_BITS - 1):
+    _SOBOL_DIRECTIONS_Y.append(
+        _SOBOL_DIRECTIONS_Y[-1] ^ (_SOBOL_DIRECTIONS_Y[-1] >> 1)
+    )
+
+
+def sobol_points(rng=None):
+    """
+    Yield 2-D Sobol points in Gray-code order, scrambled with a random
+    digital shift (XOR of every point with one random integer per axis).
+    """
+    rand_bits = (rng or random).getrandbits
+    x_bits = rand_bits(SOBOL_BITS)
+    y_bits = rand_bits(SOBOL_BITS)
+    scale = 1.0 / (1 << SOBOL_BITS)
+    for i in count(0):
+        yield x_bits * scale, y_bits * scale
+        # flip the direction number of the lowest zero bit of i
+        c = ((~i) & (i + 1)).bit_length() - 1
+        x_bits ^= _SOBOL_DIRECTIONS_X[c]
+        y_bits ^= _SOBOL_DIRECTIONS_Y[c]
+
+
+# sampler name -> point generator (selected with --sampler);
+# "random" uses rng.random() directly in monte_carlo_pi_generator()
+QUASI_SAMPLERS = {
+    "halton": halton_points,
+    "sobol": sobol_points,
+}
+SAMPLERS = ("random", *QUASI_SAMPLERS)
+
+
+def monte_carlo_pi_generator(batch_size: int = DEFAULT_MONTECARLO_BATCH,
+                             rng=None, sampler: str = DEFAULT_SAMPLER):
     """
     Yield (pi_estimate, samples_used, hits) using quarter-circle
     Monte Carlo.
@@ -83,19 +439,33 @@ def monte_carlo_pi_generator(batch_size: int = DEFAULT_MONTECARLO_BATCH):
     If x² + y² ≤ 1, the point is inside the quarter circle.
     π ≈ 4 * (hits / total_samples)
 
+    rng: optional random.Random instance (default: the global
+         random module state)
+    sampler: "random" or a key of QUASI_SAMPLERS
+
     Returns:
         tuple[float, int, int]: (pi_hat, samples_used, hits)
     """
     hits = 0
     samples_used = 0
-    rand = random.random
+    rand = (rng or random).random
+    next_point = (
+        None if sampler == "random"
+        else QUASI_SAMPLERS[sampler](rng).__next__
+    )
     while True:
         local_hits = 0
-        for _ in range(batch_size):
-            x = rand()
-            y = rand()
-            if x * x + y * y <= 1.0:
-                local_hits += 1
+        if next_point is None:
+            for _ in range(batch_size):
+                x = rand()
+                y = rand()
+                if x * x + y * y <= 1.0:
+                    local_hits += 1
+        else:
+            for _ in range(batch_size):
+                x, y = next_point()
+                if x * x + y * y <= 1.0:
+                    local_hits += 1
         hits += local_hits
         samples_used += batch_size
         p_hat = hits / samples_used
@@ -103,15 +473,520 @@ def monte_carlo_pi_generator(batch_size: int = DEFAULT_MONTECARLO_BATCH):
         yield pi_hat, samples_used, hits
 
 
+def monte_carlo_pi_generator_numpy(batch_size: int = DEFAULT_MONTECARLO_BATCH,
+                                   rng=None, sampler: str = DEFAULT_SAMPLER):
+    """
+    Vectorized version of monte_carlo_pi_generator().
+
+    Each batch of points is drawn as two NumPy arrays and the hits
+    are counted in one expression instead of a Python loop.
+    Yields the same (pi_hat, samples_used, hits) tuples.
+    Only the "random" sampler is supported.
+    """
+    if np is None:
+        raise RuntimeError("The numpy engine requires NumPy (pip install numpy)")
+    if sampler != "random":
+        raise ValueError("The numpy engine only supports the random sampler")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    hits = 0
+    samples_used = 0
+    while True:
+        x = rng.random(batch_size)
+        y = rng.random(batch_size)
+        hits += int(np.count_nonzero(x * x + y * y <= 1.0))
+        samples_used += batch_size
+        pi_hat = 4.0 * hits / samples_used
+        yield pi_hat, samples_used, hits
+
+
+# ----------------------------------------------------------------
+# Memory-mapped sample pool
+# Uniform doubles are generated once into a binary file (raw
+# little-endian float64, no header) and read back through mmap, so
+# a benchmark times the estimator without also timing the RNG
+# ----------------------------------------------------------------
+
+def write_sample_pool(path: str, n_values: int, seed: int | None = None,
+                      chunk: int = 1_000_000):
+    """Write n_values uniform [0, 1) doubles to path, chunk by chunk."""
+    with open(path, "wb") as out:
+        if np is not None:
+            rng = np.random.default_rng(seed)
+            for start in range(0, n_values, chunk):
+                rng.random(min(chunk, n_values - start)).astype("<f8").tofile(out)
+            return
+        rand = random.Random(seed).random
+        for start in range(0, n_values, chunk):
+            values = array("d", (rand() for _ in range(min(chunk, n_values - start))))
+            if values.itemsize != 8 or sys.byteorder != "little":
+                raise RuntimeError("Writing a pool without NumPy needs a "
+                                   "little-endian machine")
+            values.tofile(out)
+
+
+class SamplePool:
+    """
+    Read-only view of values start..stop of a sample pool file.
+
+    take(n) hands out the next n values without copying them (a NumPy
+    memmap slice, or a memoryview over the mmap without NumPy), so
+    consecutive trials read consecutive, disjoint parts of the file.
+    """
+
+    def __init__(self, path: str, start: int = 0, stop: int | None = None):
+        self.path = path
+        size = os.path.getsize(path) // 8
+        if np is not None:
+            self.values = np.memmap(path, dtype="<f8", mode="r")
+        else:
+            with open(path, "rb") as pool_file:
+                self._map = mmap.mmap(pool_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.values = memoryview(self._map).cast("d")
+        self.cursor = start
+        self.stop = size if stop is None else min(stop, size)
+
+    def __len__(self) -> int:
+        return self.stop - self.cursor
+
+    def take(self, n: int):
+        if self.cursor + n > self.stop:
+            raise RuntimeError(
+                f"Sample pool {self.path!r} is exhausted; write a bigger one "
+                f"with --make-pool or lower --max-samples"
+            )
+        view = self.values[self.cursor:self.cursor + n]
+        self.cursor += n
+        return view
+
+
+def pool_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    """Split a pool file into `parts` disjoint (start, stop) value ranges."""
+    size = os.path.getsize(path) // 8
+    step = size // parts
+    return [(i * step, (i + 1) * step) for i in range(parts)]
+
+
+def pool_sample_budget(pool_values: int, *, trials: int, workers: int,
+                       warmup: int, batch_size: int) -> int:
+    """
+    Largest per-run Monte Carlo sample cap (a whole number of batches)
+    that lets every run of every worker read its own part of a pool of
+    pool_values doubles (two per point), as split by pool_ranges().
+    """
+    points_per_worker = pool_values // workers // 2
+    runs_per_worker = -(-trials // workers) + warmup
+    return points_per_worker // runs_per_worker // batch_size * batch_size
+
+
+def monte_carlo_pi_generator_pool(batch_size: int = DEFAULT_MONTECARLO_BATCH,
+                                  rng=None, sampler: str = DEFAULT_SAMPLER):
+    """
+    Monte Carlo generator reading its points from a SamplePool
+    (passed as rng) instead of generating them.
+    Yields the same (pi_hat, samples_used, hits) tuples.
+    """
+    if not isinstance(rng, SamplePool):
+        raise ValueError("The pool engine needs a SamplePool (use --pool PATH)")
+    if sampler != "random":
+        raise ValueError("The pool engine only supports the random sampler")
+
+    hits = 0
+    samples_used = 0
+    while True:
+        values = rng.take(2 * batch_size)  # x0, y0, x1, y1, ...
+        if np is not None:
+            x = values[0::2]
+            y = values[1::2]
+            hits += int(np.count_nonzero(x * x + y * y <= 1.0))
+        else:
+            for i in range(0, 2 * batch_size, 2):
+                x = values[i]
+                y = values[i + 1]
+                if x * x + y * y <= 1.0:
+                    hits += 1
+        samples_used += batch_size
+        pi_hat = 4.0 * hits / samples_used
+        yield pi_hat, samples_used, hits
+
+
+# ----------------------------------------------------------------
+# Closed-form Leibniz helpers
+# The error of the Leibniz series is known ahead of time, so the
+# number of terms needed for a tolerance can be solved for directly
+# ----------------------------------------------------------------
+
+def leibniz_partial_sum(n_terms: int) -> float:
+    """
+    Return 4 * (1 - 1/3 + 1/5 - ...) using the first n_terms terms.
+
+    Uses one NumPy array reduction (pairwise summation) when NumPy is
+    available, otherwise math.fsum.
+    """
+    if n_terms <= 0:
+        return 0.0
+    if np is not None:
+        k = np.arange(n_terms, dtype=np.float64)
+        signs = 1.0 - 2.0 * (np.arange(n_terms) & 1)
+        return 4.0 * float(np.sum(signs / (2.0 * k + 1.0)))
+    return 4.0 * math.fsum(
+        (-1.0 if k & 1 else 1.0) / (2 * k + 1) for k in range(n_terms)
+    )
+
+
+def leibniz_term_bracket(tolerance: float) -> tuple[int, int]:
+    """
+    Return (low, high) bounds on the number of terms the Leibniz
+    series needs to get within tolerance of math.pi.
+
+    For an alternating series with decreasing, convex terms the
+    error after n terms sits between half of the next two terms,
+    which for 4 * Leibniz gives:  2/(2n+1) < |error| < 2/(2n-1)
+    """
+    low = max(1, math.floor((2.0 / tolerance - 1.0) / 2.0))
+    high = max(low, math.ceil((2.0 / tolerance + 1.0) / 2.0) + 1)
+    return low, high
+
+
+def leibniz_closed_form(tolerance: float, max_terms: int = 10_000_000):
+    """
+    Find the first (pi_hat, terms_used) whose error is within
+    tolerance without resuming the generator once per term.
+
+    The partial sum at the low end of the error bracket is computed
+    in one pass, then the few remaining terms of the bracket are added
+    one at a time until the stopping condition holds.
+    """
+    low, _ = leibniz_term_bracket(tolerance)
+    terms_used = min(low, max_terms)
+    pi_hat = leibniz_partial_sum(terms_used)
+
+    while abs(pi_hat - math.pi) > tolerance and terms_used < max_terms:
+        # next term k = terms_used (0-based)
+        sign = -1.0 if terms_used & 1 else 1.0
+        pi_hat += 4.0 * sign / (2 * terms_used + 1)
+        terms_used += 1
+    return pi_hat, terms_used
+
+
+# engine name -> Monte Carlo generator function (selected with --engine)
+MONTECARLO_ENGINES = {
+    "python": monte_carlo_pi_generator,
+    "numpy": monte_carlo_pi_generator_numpy,
+    "pool": monte_carlo_pi_generator_pool,
+}
+
+
+# ------------------------------------------------------------
+# More pi estimators
+# All yield (pi_estimate, terms_used) like leibniz_pi_generator()
+# ------------------------------------------------------------
+
+def nilakantha_pi_generator():
+    """
+    Yield (pi_estimate, terms_used) via the Nilakantha series:
+    π = 3 + 4/(2·3·4) - 4/(4·5·6) + 4/(6·7·8) - ...
+    """
+    pi_hat = 3.0
+    sign = 1.0
+    n = 2.0
+    for k in count(1):
+        pi_hat += sign * 4.0 / (n * (n + 1.0) * (n + 2.0))
+        yield pi_hat, k
+        sign = -sign
+        n += 2.0
+
+
+def machin_pi_generator():
+    """
+    Yield (pi_estimate, terms_used) via Machin's formula
+    π = 16·arctan(1/5) - 4·arctan(1/239), adding one term of each
+    arctangent series per step.
+    """
+    atan_5 = atan_239 = 0.0
+    power_5, power_239 = 1.0 / 5.0, 1.0 / 239.0
+    sign = 1.0
+    for k in count(0):
+        denominator = 2 * k + 1
+        atan_5 += sign * power_5 / denominator
+        atan_239 += sign * power_239 / denominator
+        yield 16.0 * atan_5 - 4.0 * atan_239, k + 1
+        sign = -sign
+        power_5 /= 25.0
+        power_239 /= 239.0 * 239.0
+
+
+def wallis_pi_generator():
+    """
+    Yield (pi_estimate, factors_used) via the Wallis product:
+    π/2 = (2/1 · 2/3) · (4/3 · 4/5) · (6/5 · 6/7) · ...
+    """
+    product = 1.0
+    for n in count(1):
+        four_n_squared = 4.0 * n * n
+        product *= four_n_squared / (four_n_squared - 1.0)
+        yield 2.0 * product, n
+
+
+def ramanujan_pi_generator():
+    """
+    Yield (pi_estimate, terms_used) via Ramanujan's 1914 series:
+    1/π = (2√2 / 9801) Σ (4k)! (1103 + 26390k) / ((k!)⁴ 396^(4k))
+    The sum is kept as an exact Fraction; each term adds ~8 digits.
+    """
+    total = Fraction(0)
+    term_ratio = Fraction(1)  # (4k)! / ((k!)^4 396^(4k)), updated per k
+    for k in count(0):
+        if k > 0:
+            term_ratio *= Fraction(
+                (4 * k - 3) * (4 * k - 2) * (4 * k - 1) * (4 * k),
+                k ** 4 * 396 ** 4,
+            )
+        total += term_ratio * (1103 + 26390 * k)
+        yield 9801.0 / (2.0 * math.sqrt(2.0) * float(total)), k + 1
+
+
+def chudnovsky_pi_generator():
+    """
+    Yield (pi_estimate, terms_used) via the Chudnovsky series:
+    1/π = 12 Σ (-1)^k (6k)! (13591409 + 545140134k)
+                 / ((3k)! (k!)³ 640320^(3k + 3/2))
+    The sum is kept as an exact Fraction; each term adds ~14 digits.
+    """
+    total = Fraction(0)
+    term_ratio = Fraction(1)  # (-1)^k (6k)! / ((3k)! (k!)^3 640320^(3k))
+    for k in count(0):
+        if k > 0:
+            term_ratio *= Fraction(
+                -(6 * k - 5) * (6 * k - 4) * (6 * k - 3)
+                * (6 * k - 2) * (6 * k - 1) * (6 * k),
+                (3 * k - 2) * (3 * k - 1) * (3 * k) * k ** 3 * 640320 ** 3,
+            )
+        total += term_ratio * (13591409 + 545140134 * k)
+        yield 640320.0 * math.sqrt(640320.0) / (12.0 * float(total)), k + 1
+
+
+# ----------------------------------------------------------------
+# Estimator registry
+# Every pi estimator the tournament can race, with its metadata.
+# To add a method, write a generator yielding (pi_estimate, used, ...)
+# and register it; run_until_tolerance() handles the stopping rule.
+# ----------------------------------------------------------------
+
+ESTIMATORS = {}
+
+
+def register_estimator(name: str, *, label: str, unit: str, max_used: int,
+                       options: tuple = ()):
+    """
+    Decorator adding a generator function to ESTIMATORS.
+
+    Args:
+        name: Key used on the command line (--methods)
+        label: Human-readable name for output
+        unit: What the generator's second value counts ("terms", ...)
+        max_used: Safety limit on that count
+        options: Keyword arguments the generator accepts, picked out of
+                 the options passed to make_estimates()
+    """
+    def decorator(generator):
+        ESTIMATORS[name] = {
+            "generator": generator, "label": label, "unit": unit,
+            "max_used": max_used, "options": options,
+        }
+        return generator
+    return decorator
+
+
+register_estimator("leibniz", label="Leibniz", unit="terms",
+                   max_used=10_000_000)(leibniz_pi_generator)
+register_estimator("leibniz-euler", label="Leibniz (Euler)", unit="terms",
+                   max_used=100_000)(leibniz_euler_generator)
+register_estimator("leibniz-aitken", label="Leibniz (Aitken)", unit="terms",
+                   max_used=100_000)(leibniz_aitken_generator)
+register_estimator("leibniz-averaging", label="Leibniz (averaging)",
+                   unit="terms", max_used=100_000)(leibniz_averaging_generator)
+register_estimator("montecarlo", label="Monte Carlo", unit="samples",
+                   max_used=20_000_000,
+                   options=("batch_size", "rng", "sampler"))(monte_carlo_pi_generator)
+register_estimator("nilakantha", label="Nilakantha", unit="terms",
+                   max_used=10_000_000)(nilakantha_pi_generator)
+register_estimator("machin", label="Machin", unit="terms",
+                   max_used=1_000)(machin_pi_generator)
+register_estimator("wallis", label="Wallis", unit="factors",
+                   max_used=10_000_000)(wallis_pi_generator)
+register_estimator("ramanujan", label="Ramanujan", unit="terms",
+                   max_used=100)(ramanujan_pi_generator)
+register_estimator("chudnovsky", label="Chudnovsky", unit="terms",
+                   max_used=100)(chudnovsky_pi_generator)
+
+
+def make_estimates(name: str, **options):
+    """Start the registered generator `name`, passing only the options it accepts."""
+    entry = ESTIMATORS[name]
+    accepted = {key: value for key, value in options.items()
+                if key in entry["options"]}
+    return entry["generator"](**accepted)
+
+
+# ------------------------------------------------------------------
+# Clock helpers
+# ------------------------------------------------------------------
+
+def _to_seconds(delta, timing: str) -> float:
+    """Convert a clock difference from TIMING_CLOCKS[timing] to seconds."""
+    return delta / 1e9 if timing == "outer-ns" else delta
+
+
+def calibrate_clock_overhead(timing: str = DEFAULT_TIMING,
+                             samples: int = 10_000) -> float:
+    """
+    Return the median cost in seconds of one back-to-back pair of
+    clock reads, i.e. what an empty timed region measures.
+    """
+    clock = TIMING_CLOCKS[timing]
+    deltas = []
+    for _ in range(samples):
+        t0 = clock()
+        t1 = clock()
+        deltas.append(t1 - t0)
+    return _to_seconds(stats.median(deltas), timing)
+
+
+# ------------------------------------------------------------------
+# Monte Carlo stopping policies
+# Each returns True when a run with `hits` out of `samples_used`
+# points should stop; z is the normal quantile for `confidence`,
+# computed once per run. Only "true-error" peeks at math.pi; the others
+# stop on how precise the estimate claims to be, so they measure the
+# cost of a guaranteed precision instead of a lucky early sample.
+# ------------------------------------------------------------------
+
+WALD_MIN_COUNT = 10  # hits and misses needed before the Wald interval is used
+
+
+def _z_score(confidence: float) -> float:
+    return stats.NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+def stop_on_true_error(pi_hat, samples_used, hits, tolerance, confidence, z):
+    return abs(pi_hat - math.pi) <= tolerance
+
+
+def stop_on_normal_interval(pi_hat, samples_used, hits, tolerance, confidence, z):
+    """
+    Normal (Wald) interval: 4·z·sqrt(p(1-p)/n) <= tolerance. With few
+    hits or misses (e.g. every point hit, so p = 1 and the width is 0)
+    the Wald interval is meaningless, so the Wilson interval decides.
+    """
+    if hits < WALD_MIN_COUNT or samples_used - hits < WALD_MIN_COUNT:
+        return stop_on_wilson_interval(pi_hat, samples_used, hits, tolerance,
+                                       confidence, z)
+    p_hat = hits / samples_used
+    half_width = z * math.sqrt(p_hat * (1.0 - p_hat) / samples_used)
+    return 4.0 * half_width <= tolerance
+
+
+def stop_on_wilson_interval(pi_hat, samples_used, hits, tolerance, confidence, z):
+    """Wilson score interval, which behaves better than Wald for small n."""
+    n = samples_used
+    p_hat = hits / n
+    half_width = (z / (1.0 + z * z / n)) * math.sqrt(
+        p_hat * (1.0 - p_hat) / n + z * z / (4.0 * n * n)
+    )
+    return 4.0 * half_width <= tolerance
+
+
+def stop_on_sequential_bound(pi_hat, samples_used, hits, tolerance, confidence, z):
+    """
+    Anytime-valid Hoeffding bound. Spending error probability
+    alpha·6/(π²n²) at sample count n keeps the overall error below
+    alpha no matter how often the run checks whether to stop.
+    """
+    n = samples_used
+    alpha_n = (1.0 - confidence) * 6.0 / (math.pi ** 2 * n * n)
+    half_width = math.sqrt(math.log(2.0 / alpha_n) / (2.0 * n))
+    return 4.0 * half_width <= tolerance
+
+
+# policy name -> stop function (selected with --stopping)
+STOPPING_POLICIES = {
+    "true-error": stop_on_true_error,
+    "normal": stop_on_normal_interval,
+    "wilson": stop_on_wilson_interval,
+    "sequential": stop_on_sequential_bound,
+}
+
+
+# ------------------------------------------------------------------
+# Generic stopping rule shared by every estimator
+# ------------------------------------------------------------------
+
+def run_until_tolerance(estimates, *, tolerance: float, max_used: int,
+                        timing: str = DEFAULT_TIMING, label: str = "Estimator",
+                        stop=None):
+    """
+    Consume (pi_estimate, used, ...) tuples from `estimates` until
+    |pi_estimate - math.pi| <= tolerance or used >= max_used.
+
+    stop: optional function of the yielded tuple replacing the
+          true-error check; timed the same way as that check.
+
+    Returns:
+        tuple[float, int, float, float]:
+        (pi_estimate, used, elapsed_seconds, final_error)
+    """
+    if timing != "per-step":
+        # no clock reads inside the loop, only around the whole run
+        clock = TIMING_CLOCKS[timing]
+        time_at_zero = clock()
+        if stop is not None:
+            for values in estimates:
+                if values[1] >= max_used or stop(*values):
+                    break
+            pi_hat, used = values[0], values[1]
+        else:
+            for pi_hat, used, *_ in estimates:
+                if abs(pi_hat - math.pi) <= tolerance or used >= max_used:
+                    break
+        elapsed = _to_seconds(clock() - time_at_zero, timing)
+        return pi_hat, used, elapsed, abs(pi_hat - math.pi)
+
+    time_at_zero = time.perf_counter()
+    if stop is not None:
+        for values in estimates:
+            elapsed = time.perf_counter() - time_at_zero
+
+            if values[1] >= max_used or stop(*values):
+                return values[0], values[1], elapsed, abs(values[0] - math.pi)
+    else:
+        for pi_hat, used, *_ in estimates:
+            error = abs(pi_hat - math.pi)
+            elapsed = time.perf_counter() - time_at_zero
+
+            if error <= tolerance or used >= max_used:
+                return pi_hat, used, elapsed, error
+
+    raise RuntimeError(
+        f"{label} failed to reach tolerance={tolerance} "
+        f"before max_used={max_used}"
+    )
+
+
 # ------------------------------------------------------------------
 # Wrapper functions that run the generators, and apply the
 # stopping condition (within tolerance of math.pi).
 # This explicitly satisfies the Profiling assignment instructions
 # run_leibniz() does not use theoretical series bound (4.0/(2k+1)+1
+#   unless mode="closed-form" is requested
 # run_montecarlo() does not use CI half-width
+#   unless a --stopping policy other than "true-error" is requested
 # ------------------------------------------------------------------
 
-def run_leibniz(*, tolerance: float, max_terms: int = 10_000_000):
+def run_leibniz(*, tolerance: float, max_terms: int = 10_000_000,
+                mode: str = DEFAULT_LEIBNIZ_MODE, verify: bool = False,
+                timing: str = DEFAULT_TIMING):
     """
     Run the Leibniz series generator until the error from math.pi
     is within the specified tolerance.
@@ -122,47 +997,83 @@ def run_leibniz(*, tolerance: float, max_terms: int = 10_000_000):
     Args:
         tolerance: Maximum acceptable absolute error from math.pi
         max_terms: Safety limit to prevent infinite loops (default: 10 million)
+        mode: "closed-form" (see leibniz_closed_form) or a key of
+              LEIBNIZ_GENERATORS: "generator" (plain term by term),
+              "euler", "aitken" or "averaging" (accelerated)
+        verify: closed-form only; re-run the generator to the same
+                term and check both agree (slow, for testing)
+        timing: "per-step", "outer" or "outer-ns" (see TIMING_CLOCKS)
 
     Returns:
         tuple[float, int, float, float]:
         (pi_estimate, terms_used, elapsed_seconds, final_error)
     """
-    time_at_zero = time.perf_counter()
-    for pi_hat, terms_used in leibniz_pi_generator():
-        error = abs(pi_hat - math.pi)
-        elapsed = time.perf_counter() - time_at_zero
+    clock = TIMING_CLOCKS[timing]
+    if mode == "closed-form":
+        time_at_zero = clock()
+        pi_hat, terms_used = leibniz_closed_form(tolerance, max_terms)
+        elapsed = _to_seconds(clock() - time_at_zero, timing)
+        if verify:
+            _verify_leibniz(pi_hat, terms_used)
+        return pi_hat, terms_used, elapsed, abs(pi_hat - math.pi)
+    if mode not in LEIBNIZ_GENERATORS:
+        raise ValueError(f"Unknown Leibniz mode: {mode!r}")
+
+    return run_until_tolerance(
+        LEIBNIZ_GENERATORS[mode](), tolerance=tolerance, max_used=max_terms,
+        timing=timing, label="Leibniz"
+    )
 
-        if error <= tolerance or terms_used >= max_terms:
-            return pi_hat, terms_used, elapsed, error
 
-    raise RuntimeError(
-        f"Leibniz failed to reach tolerance={tolerance} "
-        f"before max_terms={max_terms}"
-    )
+def _verify_leibniz(pi_hat: float, terms_used: int):
+    """Check a closed-form result against leibniz_pi_generator()."""
+    for gen_pi_hat, gen_terms in leibniz_pi_generator():
+        if gen_terms == terms_used:
+            break
+    # the generator sums left to right, so allow for float drift
+    if not math.isclose(pi_hat, gen_pi_hat, rel_tol=1e-9):
+        raise RuntimeError(
+            f"Closed-form Leibniz mismatch at {terms_used} terms: "
+            f"{pi_hat!r} != {gen_pi_hat!r}"
+        )
 
 
 def run_montecarlo(*, tolerance: float, batch_size: int = DEFAULT_MONTECARLO_BATCH,
-                   max_samples: int = 20_000_000):
+                   max_samples: int = DEFAULT_MAX_SAMPLES, engine: str = DEFAULT_ENGINE,
+                   rng=None, timing: str = DEFAULT_TIMING,
+                   sampler: str = DEFAULT_SAMPLER,
+                   stopping: str = DEFAULT_STOPPING,
+                   confidence: float = DEFAULT_CONFIDENCE):
     """
     Run Monte Carlo until |pi_hat - math.pi| <= tolerance
     (or max_samples is reached).
 
+    stopping picks another rule from STOPPING_POLICIES, e.g. "wilson"
+    stops once the `confidence` interval on pi is within tolerance.
+
+    engine picks the sample generator from MONTECARLO_ENGINES
+    ("python" or "numpy"); the stopping rule is the same for both.
+    rng is passed through to the generator (see make_rng).
+    timing: "per-step", "outer" or "outer-ns" (see TIMING_CLOCKS)
+    sampler: "random", "halton" or "sobol" (see SAMPLERS)
+
     Returns:
         tuple[float, int, float, float]:
         (pi_hat, samples_used, elapsed_seconds, error)
     """
-    time_at_zero = time.perf_counter()
-
-    for pi_hat, samples_used, hits in monte_carlo_pi_generator(batch_size=batch_size):
-        error = abs(pi_hat - math.pi)
-        elapsed = time.perf_counter() - time_at_zero
-
-        if error <= tolerance or samples_used >= max_samples:
-            return pi_hat, samples_used, elapsed, error
-
-    raise RuntimeError(
-        f"Monte Carlo failed to reach tolerance={tolerance} "
-        f"before max_samples={max_samples}"
+    generator = MONTECARLO_ENGINES[engine]
+    stop = None
+    if stopping != "true-error":
+        policy = STOPPING_POLICIES[stopping]
+        z = _z_score(confidence)  # once per run, not inside the timed loop
+
+        def stop(pi_hat, samples_used, hits):
+            return policy(pi_hat, samples_used, hits, tolerance, confidence, z)
+
+    return run_until_tolerance(
+        generator(batch_size=batch_size, rng=rng, sampler=sampler),
+        tolerance=tolerance, max_used=max_samples, timing=timing,
+        label="Monte Carlo", stop=stop
     )
 
 
@@ -172,16 +1083,96 @@ def run_montecarlo(*, tolerance: float, batch_size: int = DEFAULT_MONTECARLO_BAT
 # then prints the top functions ranked by total time spent.
 # -----------------------------------------------------------
 
+class SamplingProfiler:
+    """
+    Statistical profiler: a SIGPROF timer interrupts the program every
+    `interval` seconds of CPU time and the handler records the current
+    call stack. Use it as a context manager around any call:
+
+        with SamplingProfiler() as sp:
+            run_leibniz(tolerance=1e-4)
+        sp.write_collapsed("leibniz.folded")
+
+    Only the main thread of a Unix process can be sampled this way.
+    """
+
+    def __init__(self, interval: float = DEFAULT_PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()  # "outer;...;inner" -> sample count
+        self._previous_handler = None
+
+    def _sample(self, signum, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:"
+                         f"{code.co_name}:{code.co_firstlineno}")
+            frame = frame.f_back
+        self.stacks[";".join(reversed(names))] += 1
+
+    def __enter__(self):
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc_info):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+        return False
+
+    def write_collapsed(self, path: str):
+        """Write one "frame;frame;frame count" line per distinct stack."""
+        with open(path, "w", encoding="utf-8") as out:
+            for stack, samples in self.stacks.most_common():
+                out.write(f"{stack} {samples}\n")
+
+    def top_functions(self, limit: int = 20) -> list[tuple[str, int]]:
+        """Innermost frames ranked by how many samples landed in them."""
+        leaves = Counter()
+        for stack, samples in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += samples
+        return leaves.most_common(limit)
+
+
 def run_profile_once(tolerance: float = DEFAULT_TOLERANCE,
-                     montecarlo_batch: int = DEFAULT_MONTECARLO_BATCH):
+                     montecarlo_batch: int = DEFAULT_MONTECARLO_BATCH,
+                     engine: str = DEFAULT_ENGINE,
+                     leibniz_mode: str = DEFAULT_LEIBNIZ_MODE,
+                     sampler: str = DEFAULT_SAMPLER,
+                     profiler: str = DEFAULT_PROFILER,
+                     interval: float = DEFAULT_PROFILE_INTERVAL,
+                     collapsed_out: str | None = None,
+                     pstats_out: str | None = None):
     """
     Run profiling for one Leibniz and one Monte Carlo then
     print the top functions by tottime.
+
+    With profiler="sampling" the pair is repeated
+    PROFILE_SAMPLING_REPEATS times under SamplingProfiler instead,
+    and the top functions are ranked by samples.
     """
+    def run_pair():
+        _ = run_leibniz(tolerance=tolerance, mode=leibniz_mode)
+        _ = run_montecarlo(tolerance=tolerance, batch_size=montecarlo_batch,
+                           engine=engine, sampler=sampler)
+
+    if profiler == "sampling":
+        with SamplingProfiler(interval) as sp:
+            for _ in range(PROFILE_SAMPLING_REPEATS):
+                run_pair()
+        total = sum(sp.stacks.values())
+        print(f"\n[PROFILE: top functions by samples, {total} samples "
+              f"every {interval * 1000:g} ms]\n")
+        for name, samples in sp.top_functions(20):
+            print(f"{samples:>8} {100.0 * samples / max(total, 1):6.2f}%  {name}")
+        if collapsed_out:
+            sp.write_collapsed(collapsed_out)
+            print(f"\nCollapsed stacks written to \"{collapsed_out}\"")
+        return
+
     pr = cProfile.Profile()
     pr.enable()
-    _ = run_leibniz(tolerance=tolerance)
-    _ = run_montecarlo(tolerance=tolerance, batch_size=montecarlo_batch)
+    run_pair()
     pr.disable()
 
     s = StringIO()
@@ -189,48 +1180,985 @@ def run_profile_once(tolerance: float = DEFAULT_TOLERANCE,
         "tottime"
     ).print_stats(20)
     print("\n[PROFILE: top functions by tottime]\n" + s.getvalue())
+    if pstats_out:
+        pr.dump_stats(pstats_out)
+        print(f"Raw pstats written to \"{pstats_out}\"")
+
+
+# --------------------------------------------------------
+# Independent RNG streams for parallel workers
+# Each worker gets its own child seed, spawned from one
+# root entropy value (like numpy.random.SeedSequence.spawn)
+# --------------------------------------------------------
+
+def spawn_seeds(entropy: int, n_children: int) -> list[int]:
+    """Derive n_children independent 128-bit seeds from one entropy value."""
+    if np is not None:
+        children = np.random.SeedSequence(entropy).spawn(n_children)
+        return [
+            int.from_bytes(child.generate_state(4).tobytes(), "little")
+            for child in children
+        ]
+    return [
+        int.from_bytes(
+            hashlib.sha256(f"{entropy}:{i}".encode()).digest()[:16], "little"
+        )
+        for i in range(n_children)
+    ]
+
+
+def make_rng(engine: str, seed):
+    """Return a seeded RNG of the type the Monte Carlo engine expects."""
+    if seed is None:
+        return None
+    if engine == "numpy":
+        return np.random.default_rng(seed)
+    return random.Random(seed)
+
+
+# ----------------------------------------------------------
+# Batch size autotuner
+# Times a short calibration run for each candidate batch size
+# and remembers the fastest one for this host in a JSON file
+# ----------------------------------------------------------
+
+def _autotune_key(engine: str, tolerance: float, timing: str,
+                  sampler: str, stopping: str, confidence: float,
+                  max_samples: int) -> str:
+    return (f"{platform.node()}|{engine}|{tolerance:g}|{timing}|{sampler}"
+            f"|{stopping}|{confidence:g}|{max_samples}")
+
+
+def _load_autotune_cache(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as cache:
+            return json.load(cache)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def autotune_batch_size(*, tolerance: float, engine: str = DEFAULT_ENGINE,
+                        timing: str = DEFAULT_TIMING,
+                        sampler: str = DEFAULT_SAMPLER,
+                        stopping: str = DEFAULT_STOPPING,
+                        confidence: float = DEFAULT_CONFIDENCE,
+                        max_samples: int = DEFAULT_MAX_SAMPLES,
+                        cache_path: str = AUTOTUNE_CACHE,
+                        trials: int = AUTOTUNE_TRIALS,
+                        retune: bool = False) -> tuple[int, bool]:
+    """
+    Return the Monte Carlo batch size with the lowest median
+    time-to-tolerance on this machine.
+
+    The result is cached per (host, engine, tolerance, timing, sampler,
+    stopping, confidence, max_samples), the settings that change what
+    is timed; a cached value is reused unless retune is True.
+
+    Returns:
+        tuple[int, bool]: (batch_size, came_from_cache)
+    """
+    key = _autotune_key(engine, tolerance, timing, sampler, stopping,
+                        confidence, max_samples)
+    cache = _load_autotune_cache(cache_path)
+    if not retune and key in cache:
+        return int(cache[key]["batch_size"]), True
+
+    medians = {}
+    for batch_size in AUTOTUNE_CANDIDATES[engine]:
+        times = [
+            run_montecarlo(tolerance=tolerance, batch_size=batch_size,
+                           engine=engine, timing=timing, sampler=sampler,
+                           stopping=stopping, confidence=confidence,
+                           max_samples=max_samples)[2]
+            for _ in range(trials)
+        ]
+        medians[batch_size] = stats.median(times)
+    best = min(medians, key=medians.get)
+
+    cache[key] = {
+        "batch_size": best,
+        "median_seconds": medians[best],
+        "tuned_on": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(cache_path, "w", encoding="utf-8") as cache_file:
+        json.dump(cache, cache_file, indent=2)
+    return best, False
+
+
+def samples_to_tolerance_by_sampler(*, tolerance: float, batch_size: int,
+                                    runs: int = SAMPLER_COMPARISON_RUNS,
+                                    max_samples: int = SAMPLER_COMPARISON_MAX_SAMPLES
+                                    ) -> dict:
+    """
+    Return {sampler: median samples needed to reach tolerance} over
+    `runs` Monte Carlo runs per sampler (capped at max_samples).
+    """
+    medians = {}
+    for sampler in SAMPLERS:
+        samples = [
+            run_montecarlo(tolerance=tolerance, batch_size=batch_size,
+                           max_samples=max_samples, timing="outer",
+                           sampler=sampler)[1]
+            for _ in range(runs)
+        ]
+        medians[sampler] = stats.median(samples)
+    return medians
+
+
+# ------------------------------------------------------------
+# Streaming statistics
+# Summarize trial timings one value at a time in constant memory
+# instead of keeping every timing in a list
+# ------------------------------------------------------------
+
+class P2Quantile:
+    """
+    Estimate one quantile of a stream with the P² algorithm
+    (Jain & Chlamtac, 1985), which keeps just five markers.
+    """
+
+    def __init__(self, q: float):
+        self.q = q
+        self.count = 0
+        self.heights = []  # marker heights (first 5 values until full)
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self.increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    def add(self, x: float):
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # find the cell k containing x, stretching the ends if needed
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # nudge the three middle markers toward their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - positions[i]
+            if ((d >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (d <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (
+                        (heights[i + step] - heights[i])
+                        / (positions[i + step] - positions[i])
+                    )
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        if self.count > 5:
+            return self.heights[2]
+        # too few values for markers yet: exact quantile of what we have
+        return _percentile(self.heights, self.q * 100)
+
+
+class StreamingStats:
+    """
+    Constant-memory summary of a stream of timings: count, Welford
+    mean/variance, min/max, P² quantile estimates and a log-bucketed
+    histogram.
+
+    The first exact_limit timings (all of them if None) are also kept,
+    and while they are, quantile() is exact; P² is far off on a few
+    dozen skewed timings. Summaries from different worker processes can
+    be merge()d. P² markers cannot be combined, so a merged summary past
+    the limit answers quantile() from the histogram instead (within one
+    bucket, about 2.3%).
+    """
+
+    def __init__(self, quantiles=REPORTED_QUANTILES,
+                 exact_limit: int | None = EXACT_QUANTILE_LIMIT):
+        self.exact_limit = exact_limit
+        self.values = []  # None once there are more than exact_limit
+        self._sorted = True
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram = {}  # log bucket index -> count
+        self.estimators = {q: P2Quantile(q) for q in quantiles}
+
+    def add(self, x: float):
+        if self.values is not None:
+            if self.exact_limit is not None and self.count >= self.exact_limit:
+                self.values = None
+            else:
+                self.values.append(x)
+                self._sorted = False
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        bucket = self._bucket(x)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        if self.estimators is not None:
+            for estimator in self.estimators.values():
+                estimator.add(x)
+
+    @staticmethod
+    def _bucket(x: float):
+        if x <= 0:
+            return None  # zero-length timings get their own bucket
+        return math.floor(math.log10(x) * HISTOGRAM_BUCKETS_PER_DECADE)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def merge(self, other: "StreamingStats"):
+        """Fold another summary into this one (Chan et al. for the variance)."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for bucket, n in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + n
+        self.estimators = None
+        if (self.values is None or other.values is None
+                or (self.exact_limit is not None and total > self.exact_limit)):
+            self.values = None
+        else:
+            self.values.extend(other.values)
+            self._sorted = False
+
+    def quantile(self, q: float) -> float:
+        if self.values:
+            if not self._sorted:
+                self.values.sort()
+                self._sorted = True
+            return _percentile(self.values, q * 100)
+
+        if self.estimators is not None and q in self.estimators:
+            # each P² estimate is independent, so keep them monotone in q
+            return max(estimator.value() for other_q, estimator
+                       in self.estimators.items() if other_q <= q)
+
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.histogram, key=lambda b: -math.inf if b is None else b):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                if bucket is None:
+                    return 0.0
+                middle = 10 ** ((bucket + 0.5) / HISTOGRAM_BUCKETS_PER_DECADE)
+                return min(max(middle, self.min), self.max)
+        return self.max
 
 
 # ------------------
 # Run 1,000 trials
 # ------------------
 
+def pin_to_cpu(cpu: int):
+    """Restrict this process (and workers it forks) to one CPU (Linux only)."""
+    if not hasattr(os, "sched_setaffinity"):
+        raise RuntimeError("CPU pinning needs os.sched_setaffinity (Linux)")
+    os.sched_setaffinity(0, {cpu})
+
+
+def _leibniz_runs_first(order: str, trial_index: int, order_rng) -> bool:
+    if order == "alternate":
+        return trial_index % 2 == 0
+    if order == "random":
+        return order_rng.random() < 0.5
+    return True  # "fixed"
+
+
+def _run_trial_chunk(n_trials: int, tolerance: float, montecarlo_batch: int,
+                     engine: str, leibniz_mode: str,
+                     timing: str = DEFAULT_TIMING,
+                     sampler: str = DEFAULT_SAMPLER, keep_raw: bool = True,
+                     order: str = DEFAULT_ORDER, warmup: int = 0,
+                     seed=None, stopping: str = DEFAULT_STOPPING,
+                     confidence: float = DEFAULT_CONFIDENCE,
+                     max_samples: int = DEFAULT_MAX_SAMPLES,
+                     pool_path: str | None = None,
+                     pool_range: tuple[int, int] | None = None) -> dict:
+    """
+    Run n_trials Leibniz/Monte Carlo pairs in this process, after
+    `warmup` untimed pairs. Top-level so ProcessPoolExecutor can pickle it.
+
+    Timings are fed into StreamingStats as they are measured; the raw
+    lists (and which method ran first) are only kept when keep_raw is
+    True (needed by the store), and then every quantile is exact.
+
+    Returns:
+        dict with leibniz_stats, montecarlo_stats, montecarlo_wins,
+        order_stats ({"leibniz_first": StreamingStats, ...}),
+        montecarlo_samples (StreamingStats), montecarlo_within (count of
+        runs that really ended within tolerance),
+        leibniz_times, montecarlo_times, leibniz_first (lists or None),
+        last_pi_lei, last_pi_mc
+    """
+    if engine == "pool":
+        rng = SamplePool(pool_path, *(pool_range or (0, None)))
+    else:
+        rng = make_rng(engine, seed)
+    # separate stream so the order does not shift the Monte Carlo points
+    order_rng = random.Random(f"order:{seed}") if seed is not None else random
+
+    def run_leibniz_once():
+        return run_leibniz(tolerance=tolerance, mode=leibniz_mode, timing=timing)
+
+    def run_montecarlo_once():
+        run_max = max_samples
+        if engine == "pool":
+            # never ask for more batches than the rest of the pool holds
+            run_max = min(max_samples, len(rng) // 2 // montecarlo_batch * montecarlo_batch)
+        return run_montecarlo(
+            tolerance=tolerance, batch_size=montecarlo_batch, engine=engine,
+            rng=rng, timing=timing, sampler=sampler, stopping=stopping,
+            confidence=confidence, max_samples=run_max
+        )
+
+    for _ in range(warmup):
+        run_leibniz_once()
+        run_montecarlo_once()
+
+    # with the raw lists kept anyway, every quantile printed is exact
+    exact_limit = None if keep_raw else EXACT_QUANTILE_LIMIT
+    result = {
+        "leibniz_stats": StreamingStats(exact_limit=exact_limit),
+        "montecarlo_stats": StreamingStats(exact_limit=exact_limit),
+        "montecarlo_wins": 0,  # "usually not always" count
+        "order_stats": {key: StreamingStats(exact_limit=exact_limit) for key in (
+            "leibniz_first", "leibniz_second",
+            "montecarlo_first", "montecarlo_second")},
+        "montecarlo_samples": StreamingStats(exact_limit=exact_limit),
+        "montecarlo_within": 0,
+        "leibniz_times": [] if keep_raw else None,
+        "montecarlo_times": [] if keep_raw else None,
+        "leibniz_first": [] if keep_raw else None,
+        "last_pi_lei": None,
+        "last_pi_mc": None,
+    }
+    order_stats = result["order_stats"]
+
+    for trial_index in range(n_trials):
+        # t_lei, t_mc: runtime duration of one trial
+        leibniz_first = _leibniz_runs_first(order, trial_index, order_rng)
+        if leibniz_first:
+            pi_hat_lei, _, t_lei, _ = run_leibniz_once()
+            pi_hat_mc, samples_mc, t_mc, error_mc = run_montecarlo_once()
+        else:
+            pi_hat_mc, samples_mc, t_mc, error_mc = run_montecarlo_once()
+            pi_hat_lei, _, t_lei, _ = run_leibniz_once()
+
+        result["montecarlo_samples"].add(samples_mc)
+        if error_mc <= tolerance:
+            result["montecarlo_within"] += 1
+
+        result["leibniz_stats"].add(t_lei)
+        result["montecarlo_stats"].add(t_mc)
+        position = "first" if leibniz_first else "second"
+        other = "second" if leibniz_first else "first"
+        order_stats[f"leibniz_{position}"].add(t_lei)
+        order_stats[f"montecarlo_{other}"].add(t_mc)
+        if t_mc < t_lei:
+            result["montecarlo_wins"] += 1
+        if keep_raw:
+            result["leibniz_times"].append(t_lei)
+            result["montecarlo_times"].append(t_mc)
+            result["leibniz_first"].append(leibniz_first)
+        result["last_pi_lei"] = pi_hat_lei
+        result["last_pi_mc"] = pi_hat_mc
+
+    return result
+
+
+def _merge_chunk_results(results: list[dict]) -> dict:
+    """Combine _run_trial_chunk() results from several workers, in order."""
+    merged = results[0]
+    for result in results[1:]:
+        merged["leibniz_stats"].merge(result["leibniz_stats"])
+        merged["montecarlo_stats"].merge(result["montecarlo_stats"])
+        merged["montecarlo_wins"] += result["montecarlo_wins"]
+        merged["montecarlo_samples"].merge(result["montecarlo_samples"])
+        merged["montecarlo_within"] += result["montecarlo_within"]
+        for key, summary in result["order_stats"].items():
+            merged["order_stats"][key].merge(summary)
+        for key in ("leibniz_times", "montecarlo_times", "leibniz_first"):
+            if merged[key] is not None:
+                merged[key].extend(result[key])
+        merged["last_pi_lei"] = result["last_pi_lei"]
+        merged["last_pi_mc"] = result["last_pi_mc"]
+    return merged
+
+
 def run_trials(*, trials: int, tolerance: float, montecarlo_batch: int,
-               profile: bool = False):
+               profile: bool = False, engine: str = DEFAULT_ENGINE,
+               leibniz_mode: str = DEFAULT_LEIBNIZ_MODE,
+               workers: int = DEFAULT_WORKERS, seed: int | None = None,
+               timing: str = DEFAULT_TIMING, store: str | None = None,
+               compare: bool = False, autotuned: bool = False,
+               sampler: str = DEFAULT_SAMPLER,
+               profiler: str = DEFAULT_PROFILER,
+               profile_interval: float = DEFAULT_PROFILE_INTERVAL,
+               collapsed_out: str | None = None,
+               pstats_out: str | None = None,
+               order: str = DEFAULT_ORDER, warmup: int = 0,
+               stopping: str = DEFAULT_STOPPING,
+               confidence: float = DEFAULT_CONFIDENCE,
+               max_samples: int = DEFAULT_MAX_SAMPLES,
+               pool_path: str | None = None,
+               compare_samplers: bool = False):
     if profile:
         run_profile_once(
-            tolerance=tolerance, montecarlo_batch=montecarlo_batch
+            tolerance=tolerance, montecarlo_batch=montecarlo_batch,
+            engine=engine, leibniz_mode=leibniz_mode, sampler=sampler,
+            profiler=profiler, interval=profile_interval,
+            collapsed_out=collapsed_out, pstats_out=pstats_out
         )
 
-    leibniz_times, montecarlo_times = [], []
-    montecarlo_faster_count = 0  # "usually not always" count
-    last_pi_lei = None
-    last_pi_mc = None
+    keep_raw = store is not None
+    stopping_options = {"stopping": stopping, "confidence": confidence,
+                        "max_samples": max_samples}
+    if workers <= 1:
+        result = _run_trial_chunk(trials, tolerance, montecarlo_batch,
+                                  engine, leibniz_mode, timing, sampler,
+                                  keep_raw, order, warmup, seed,
+                                  pool_path=pool_path, **stopping_options)
+    else:
+        # split trials as evenly as possible, one chunk per worker
+        workers = min(workers, trials)
+        chunk_sizes = [trials // workers + (i < trials % workers)
+                       for i in range(workers)]
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(128)
+        seeds = spawn_seeds(seed, workers)
+        # each worker reads its own part of the sample pool
+        ranges = (pool_ranges(pool_path, workers) if engine == "pool"
+                  else [None] * workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_trial_chunk, size, tolerance,
+                            montecarlo_batch, engine, leibniz_mode, timing,
+                            sampler, keep_raw, order, warmup, child,
+                            pool_path=pool_path, pool_range=pool_range,
+                            **stopping_options)
+                for size, child, pool_range in zip(chunk_sizes, seeds, ranges)
+            ]
+            # collect in submission order so results are deterministic
+            result = _merge_chunk_results([future.result() for future in futures])
+
+    leibniz_stats = result["leibniz_stats"]
+    montecarlo_stats = result["montecarlo_stats"]
+    montecarlo_faster_count = result["montecarlo_wins"]
+    leibniz_times = result["leibniz_times"]
+    montecarlo_times = result["montecarlo_times"]
+    last_pi_lei, last_pi_mc = result["last_pi_lei"], result["last_pi_mc"]
+
+    # measured separately so it is never mixed into the trial times
+    clock_overhead = calibrate_clock_overhead(timing)
+
+    median_leib = leibniz_stats.quantile(0.5)
+    median_montecarlo = montecarlo_stats.quantile(0.5)
+    sampler_samples = None
+    if compare_samplers:
+        sampler_samples = samples_to_tolerance_by_sampler(
+            tolerance=tolerance, batch_size=montecarlo_batch,
+            runs=min(trials, SAMPLER_COMPARISON_RUNS)
+        )
+
+    _print_results(
+        trials, tolerance, montecarlo_batch,
+        median_leib, median_montecarlo,
+        montecarlo_faster_count, last_pi_lei, last_pi_mc,
+        engine=engine, leibniz_mode=leibniz_mode, workers=workers,
+        timing=timing, clock_overhead=clock_overhead, autotuned=autotuned,
+        sampler=sampler, sampler_samples=sampler_samples,
+        leibniz_stats=leibniz_stats, montecarlo_stats=montecarlo_stats,
+        order=order, warmup=warmup, order_stats=result["order_stats"],
+        stopping=stopping, montecarlo_samples=result["montecarlo_samples"],
+        montecarlo_within=result["montecarlo_within"]
+    )
+
+    if store is None:
+        return
+    # every setting that changes the timings, so --compare only tests
+    # runs that measured the same thing
+    config = {
+        "engine": engine, "montecarlo_batch": montecarlo_batch,
+        "tolerance": tolerance, "trials": trials,
+        "leibniz_mode": leibniz_mode, "timing": timing, "sampler": sampler,
+        "order": order, "stopping": stopping, "confidence": confidence,
+        "max_samples": max_samples, "workers": workers, "warmup": warmup,
+        "pool": pool_path,
+    }
+    # look up the previous run before this one is appended
+    previous = load_previous_record(store, config) if compare else None
+    record = build_record(config, leibniz_times, montecarlo_times,
+                          clock_overhead=clock_overhead)
+    record["leibniz_first"] = result["leibniz_first"]
+    append_record(store, record)
+    print(f"\nResults appended to \"{store}\"")
+    if compare:
+        _print_comparison(previous, record)
+
+
+# -------------------------------------------------------------
+# Batched multi-trial Monte Carlo
+# All trials are simulated together as rows of a 2-D array, so
+# one NumPy pass replaces a Python loop per trial
+# -------------------------------------------------------------
+
+def montecarlo_samples_to_tolerance(*, trials: int, tolerance: float,
+                                    batch_size: int = DEFAULT_MONTECARLO_BATCH,
+                                    max_samples: int = DEFAULT_MAX_SAMPLES,
+                                    block: int = BATCHED_BLOCK_SAMPLES,
+                                    rng=None):
+    """
+    Return a NumPy array with, for each of `trials` independent Monte
+    Carlo runs, the samples used when |pi_hat - math.pi| <= tolerance
+    first held (the cap if it never did).
+
+    Like run_montecarlo(), the stopping rule is only checked after
+    every batch_size samples, so the cap is max_samples rounded up to a
+    whole number of batches. Samples are drawn in blocks of about
+    trials x `block` values for the trials that have not converged yet
+    (fewer rows get wider blocks), with cumsum for the running hit
+    counts and argmax for each row's first hit of the tolerance.
+    """
+    if np is None:
+        raise RuntimeError("Batched Monte Carlo requires NumPy (pip install numpy)")
+    if rng is None:
+        rng = np.random.default_rng()
+    block_values = trials * max(batch_size, block)
+    # every block then ends on a batch, which the argmax below needs
+    max_samples = -(-max_samples // batch_size) * batch_size
+
+    samples_needed = np.full(trials, max_samples, dtype=np.int64)
+    active = np.arange(trials)                    # rows still running
+    hits = np.zeros(trials, dtype=np.int64)       # hits so far, per active row
+    samples_done = 0
+
+    while active.size and samples_done < max_samples:
+        width = max(batch_size, block_values // active.size // batch_size * batch_size)
+        width = min(width, max_samples - samples_done)
+        x = rng.random((active.size, width))
+        y = rng.random((active.size, width))
+        running_hits = np.cumsum(x * x + y * y <= 1.0, axis=1, dtype=np.int64)
+        running_hits += hits[:, None]
+
+        # only look at the end of each batch, as the generator does
+        columns = np.arange(batch_size - 1, width, batch_size)
+        samples_used = samples_done + columns + 1
+        pi_hat = 4.0 * running_hits[:, columns] / samples_used
+        within = np.abs(pi_hat - math.pi) <= tolerance
+
+        done = within.any(axis=1)
+        first = within.argmax(axis=1)
+        samples_needed[active[done]] = samples_used[first[done]]
+
+        hits = running_hits[~done, -1]
+        active = active[~done]
+        samples_done += width
+
+    return samples_needed
+
+
+def run_batched_montecarlo(*, trials: int, tolerance: float,
+                           batch_size: int = DEFAULT_MONTECARLO_BATCH,
+                           max_samples: int = DEFAULT_MAX_SAMPLES,
+                           seed: int | None = None, width: int = 60):
+    """Print the samples-to-tolerance distribution from one batched pass."""
+    time_at_zero = time.perf_counter()
+    samples = montecarlo_samples_to_tolerance(
+        trials=trials, tolerance=tolerance, batch_size=batch_size,
+        max_samples=max_samples, rng=np.random.default_rng(seed)
+    )
+    elapsed = time.perf_counter() - time_at_zero
+
+    seps = "-" * width
+    print(f"\nBATCHED MONTE CARLO ({trials:,} trials, tolerance {tolerance:g}, "
+          f"batch {batch_size})")
+    print(seps)
+    for label, value in (
+            ("Median samples to tolerance", np.median(samples)),
+            ("p90 samples to tolerance", np.percentile(samples, 90)),
+            ("p99 samples to tolerance", np.percentile(samples, 99)),
+            ("Max samples to tolerance", samples.max()),
+    ):
+        print(f"{label:<35} {value:>24,.0f}")
+    print(f"{'Wall time for all trials (ms)':<35} {elapsed * 1000:>24.2f}")
+    print(seps)
+
+
+# ----------------------------------------------------------
+# N-way tournament
+# Every trial runs each chosen estimator once; the harness
+# reports medians and how often each method beat each other
+# ----------------------------------------------------------
+
+def run_tournament(*, trials: int, tolerance: float,
+                   methods=None, timing: str = DEFAULT_TIMING,
+                   montecarlo_batch: int = DEFAULT_MONTECARLO_BATCH,
+                   sampler: str = DEFAULT_SAMPLER):
+    """
+    Race the registered estimators named in `methods` (default: all)
+    for `trials` trials and print the ranking.
+    """
+    methods = list(methods or ESTIMATORS)
+    options = {"batch_size": montecarlo_batch, "sampler": sampler}
+    time_stats = {name: StreamingStats() for name in methods}
+    used_stats = {name: StreamingStats() for name in methods}
+    wins = {a: {b: 0 for b in methods} for a in methods}  # wins[a][b]: a beat b
 
     for _ in range(trials):
-        # t_lei, t_mc: runtime duration of one trial
-        pi_hat_lei, _, t_lei, _ = run_leibniz(tolerance=tolerance)
-        pi_hat_mc, _, t_mc, _ = run_montecarlo(
-            tolerance=tolerance, batch_size=montecarlo_batch
+        times = {}
+        for name in methods:
+            entry = ESTIMATORS[name]
+            _, used, elapsed, _ = run_until_tolerance(
+                make_estimates(name, **options), tolerance=tolerance,
+                max_used=entry["max_used"], timing=timing,
+                label=entry["label"]
+            )
+            times[name] = elapsed
+            time_stats[name].add(elapsed)
+            used_stats[name].add(used)
+        for a in methods:
+            for b in methods:
+                if a != b and times[a] < times[b]:
+                    wins[a][b] += 1
+
+    _print_tournament(trials, tolerance, methods, time_stats, used_stats, wins)
+
+
+def _print_tournament(trials, tolerance, methods, time_stats, used_stats,
+                      wins, width: int = 60):
+    ranking = sorted(methods, key=lambda name: time_stats[name].quantile(0.5))
+    seps = "-" * width
+
+    print(f"\nTOURNAMENT ({trials:,} trials, tolerance {tolerance:g})")
+    print(seps)
+    print(f"{'#':>2}  {'Method':<20}{'median us':>12}{'median used':>16}")
+    for place, name in enumerate(ranking, start=1):
+        entry = ESTIMATORS[name]
+        used = f"{used_stats[name].quantile(0.5):,.0f} {entry['unit']}"
+        print(f"{place:>2}  {entry['label']:<20}"
+              f"{time_stats[name].quantile(0.5) * 1_000_000:>12.2f}{used:>16}")
+    print(seps)
+
+    print("Pairwise win rate (row beat column, % of trials)")
+    print(" " * 4 + "".join(f"{i:>7}" for i in range(1, len(ranking) + 1)))
+    for i, a in enumerate(ranking, start=1):
+        cells = "".join(
+            f"{'-':>7}" if a == b else f"{100.0 * wins[a][b] / trials:>6.1f}%"
+            for b in ranking
         )
+        print(f"{i:>2}  {cells}")
+    print(seps)
 
-        leibniz_times.append(t_lei)
-        montecarlo_times.append(t_mc)
-        if t_mc < t_lei:
-            montecarlo_faster_count += 1
-        last_pi_lei = pi_hat_lei
-        last_pi_mc = pi_hat_mc
 
-    median_leib = stats.median(leibniz_times)
-    median_montecarlo = stats.median(montecarlo_times)
+# -------------------------------------------------------------
+# High-precision mode
+# Floats stop at ~16 digits, so these compute pi as a Decimal.
+# Both series are summed with binary splitting: the sum of terms
+# a..b is built from exact integer (P, Q, T) products of the two
+# halves, which keeps the big-number multiplications balanced.
+# -------------------------------------------------------------
 
-    _print_results(
-        trials, tolerance, montecarlo_batch,
-        median_leib, median_montecarlo,
-        montecarlo_faster_count, last_pi_lei, last_pi_mc
+def _arctan_inv_split(x: int, a: int, b: int) -> tuple[int, int, int, int]:
+    """
+    Binary splitting for terms a..b-1 of
+    arctan(1/x) = (1/x) Σ (-1)^k / ((2k+1) x^(2k)).
+
+    Returns (P, Q, B, T) with partial sum = T / (B * Q).
+    """
+    if b - a == 1:
+        p, q = (1, 1) if a == 0 else (-1, x * x)
+        return p, q, 2 * a + 1, p
+    m = (a + b) // 2
+    p_left, q_left, b_left, t_left = _arctan_inv_split(x, a, m)
+    p_right, q_right, b_right, t_right = _arctan_inv_split(x, m, b)
+    return (
+        p_left * p_right,
+        q_left * q_right,
+        b_left * b_right,
+        b_right * q_right * t_left + b_left * p_left * t_right,
     )
 
 
+def _arctan_inv_decimal(x: int, digits: int) -> Decimal:
+    """arctan(1/x) to `digits` decimal places (current context precision)."""
+    # each term shrinks by a factor x², so this many terms reach 10^-digits
+    n_terms = int(digits / (2 * math.log10(x))) + 2
+    _, q, b, t = _arctan_inv_split(x, 0, n_terms)
+    return Decimal(t) / (Decimal(b) * Decimal(q) * x)
+
+
+def pi_machin_decimal(digits: int) -> Decimal:
+    """π = 16·arctan(1/5) - 4·arctan(1/239) to `digits` decimal places."""
+    with localcontext() as ctx:
+        ctx.prec = digits + GUARD_DIGITS
+        return 16 * _arctan_inv_decimal(5, digits) - 4 * _arctan_inv_decimal(239, digits)
+
+
+CHUDNOVSKY_C3_OVER_24 = 640320 ** 3 // 24
+CHUDNOVSKY_DIGITS_PER_TERM = math.log10(CHUDNOVSKY_C3_OVER_24 * 24 / 1728)  # ~14.18
+
+
+def _chudnovsky_split(a: int, b: int) -> tuple[int, int, int]:
+    """Binary splitting (P, Q, T) for terms a..b-1 of the Chudnovsky series."""
+    if b - a == 1:
+        if a == 0:
+            p = q = 1
+        else:
+            p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q = a * a * a * CHUDNOVSKY_C3_OVER_24
+        t = p * (13591409 + 545140134 * a)
+        return p, q, -t if a & 1 else t
+    m = (a + b) // 2
+    p_left, q_left, t_left = _chudnovsky_split(a, m)
+    p_right, q_right, t_right = _chudnovsky_split(m, b)
+    return p_left * p_right, q_left * q_right, q_right * t_left + p_left * t_right
+
+
+def pi_chudnovsky_decimal(digits: int) -> Decimal:
+    """π = 426880·√10005·Q / T (Chudnovsky) to `digits` decimal places."""
+    n_terms = int(digits / CHUDNOVSKY_DIGITS_PER_TERM) + 2
+    _, q, t = _chudnovsky_split(0, n_terms)
+    with localcontext() as ctx:
+        ctx.prec = digits + GUARD_DIGITS
+        return Decimal(426880) * Decimal(10005).sqrt() * q / t
+
+
+# method name -> function(digits) returning pi as a Decimal
+HIGH_PRECISION_METHODS = {
+    "machin": pi_machin_decimal,
+    "chudnovsky": pi_chudnovsky_decimal,
+}
+
+
+def run_precision_trials(*, trials: int, digits: int,
+                         timing: str = DEFAULT_TIMING, width: int = 60):
+    """
+    Time every HIGH_PRECISION_METHODS entry computing pi to `digits`
+    digits, check the results agree within 10^-digits, and print
+    median times and digits-per-second throughput.
+    """
+    clock = TIMING_CLOCKS[timing]
+    time_stats = {name: StreamingStats() for name in HIGH_PRECISION_METHODS}
+    results = {}
+    for _ in range(trials):
+        for name, method in HIGH_PRECISION_METHODS.items():
+            time_at_zero = clock()
+            results[name] = method(digits)
+            time_stats[name].add(_to_seconds(clock() - time_at_zero, timing))
+
+    # no float reference exists at this precision, so cross-check the
+    # methods against each other (and math.pi for the leading digits)
+    with localcontext() as ctx:
+        ctx.prec = digits + GUARD_DIGITS
+        tolerance = Decimal(10) ** -digits
+        values = list(results.values())
+        agree = all(abs(value - values[0]) <= tolerance for value in values)
+    leading_ok = all(abs(float(value) - math.pi) < 1e-15 for value in values)
+
+    seps = "-" * width
+    print(f"\nHIGH-PRECISION RESULTS ({trials:,} trials, {digits:,} digits)")
+    print(seps)
+    print(f"{'Method':<14}{'median ms':>14}{'digits/second':>20}")
+    for name in sorted(HIGH_PRECISION_METHODS,
+                       key=lambda name: time_stats[name].quantile(0.5)):
+        median = time_stats[name].quantile(0.5)
+        print(f"{name:<14}{median * 1000:>14.3f}"
+              f"{digits / max(median, 1e-12):>20,.0f}")
+    print(seps)
+    print(f"Methods agree within 1e-{digits}: {'yes' if agree and leading_ok else 'NO'}")
+    shown = str(values[0])[:min(digits, 40) + 2]  # "3." plus the digits
+    print(f"pi = {shown}{'...' if digits > 40 else ''}")
+    print(seps)
+
+
+# ---------------------------------------------------------
+# Result store and regression check
+# One JSON object per line, so runs can be appended cheaply
+# and compared with the Mann-Whitney U test later on
+# ---------------------------------------------------------
+
+def _percentile(sorted_values, q: float) -> float:
+    """Linear-interpolated percentile (q in 0..100) of sorted values."""
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def _summarize(times) -> dict:
+    ordered = sorted(times)
+    return {
+        "median": stats.median(ordered),
+        "p10": _percentile(ordered, 10),
+        "p90": _percentile(ordered, 90),
+        "p99": _percentile(ordered, 99),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def _git_revision():
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def build_record(config: dict, leibniz_times, montecarlo_times, *,
+                 clock_overhead: float) -> dict:
+    """Bundle one run's settings, summary statistics and raw times."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        **config,
+        "clock_overhead": clock_overhead,
+        "leibniz": _summarize(leibniz_times),
+        "montecarlo": _summarize(montecarlo_times),
+        "host": {
+            "node": platform.node(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "git_revision": _git_revision(),
+        "leibniz_times": leibniz_times,
+        "montecarlo_times": montecarlo_times,
+    }
+
+
+def append_record(path: str, record: dict):
+    with open(path, "a", encoding="utf-8") as store:
+        store.write(json.dumps(record) + "\n")
+
+
+def load_previous_record(path: str, config: dict):
+    """
+    Return the most recent stored record run with the same settings
+    as config, or None if there is no such record (or no store yet).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as store:
+            lines = store.readlines()
+    except FileNotFoundError:
+        return None
+
+    for line in reversed(lines):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # skip a truncated line from an interrupted run
+        if all(record.get(key) == value for key, value in config.items()):
+            return record
+    return None
+
+
+def mann_whitney_u(current, previous) -> tuple[float, float]:
+    """
+    One-sided Mann-Whitney U test that `current` tends to be larger
+    (slower) than `previous`.
+
+    Uses the normal approximation with tie correction, which is
+    accurate for the hundreds-of-trials samples this program collects.
+
+    Returns:
+        tuple[float, float]: (U statistic for current, p-value)
+    """
+    n1, n2 = len(current), len(previous)
+    combined = sorted(
+        [(value, 0) for value in current] + [(value, 1) for value in previous]
+    )
+
+    # average ranks over ties, and collect tie sizes for the correction
+    rank_sum_current = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2.0 + 1.0
+        rank_sum_current += average_rank * sum(
+            1 for _, group in combined[i:j + 1] if group == 0
+        )
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    n = n1 + n2
+    u_current = rank_sum_current - n1 * (n1 + 1) / 2.0
+    mean_u = n1 * n2 / 2.0
+    var_u = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var_u <= 0:
+        return u_current, 1.0
+    z = (u_current - mean_u - 0.5) / math.sqrt(var_u)  # continuity correction
+    return u_current, 1.0 - stats.NormalDist().cdf(z)
+
+
+def _print_comparison(previous, record, alpha: float = REGRESSION_ALPHA,
+                      width: int = 60):
+    print("\nCOMPARISON WITH PREVIOUS RUN")
+    print("-" * width)
+    if previous is None:
+        print("No previous run with the same settings was found.")
+        print("-" * width)
+        return
+
+    print(f"Previous run: {previous['timestamp']} "
+          f"(git {str(previous.get('git_revision'))[:10]})")
+    for label, key in (("Leibniz", "leibniz"), ("Monte Carlo", "montecarlo")):
+        current_times = record[f"{key}_times"]
+        previous_times = previous[f"{key}_times"]
+        _, p_value = mann_whitney_u(current_times, previous_times)
+        before = previous[key]["median"] * 1_000_000
+        after = record[key]["median"] * 1_000_000
+        verdict = "SLOWER" if p_value < alpha else "ok"
+        print(f"{label:<12} median {before:10.2f} -> {after:10.2f} us  "
+              f"p={p_value:.4f}  {verdict}")
+    print("-" * width)
+
+
 # -----------------------
 # Display output helpers
 # -----------------------
@@ -256,7 +2184,20 @@ def _print_banner_end(end_time, total_elapsed):
 
 
 def _print_results(trials, tolerance, mc_batch, med_leib, med_mc,
-                   mc_wins, last_pi_lei, last_pi_mc, width: int = 60):
+                   mc_wins, last_pi_lei, last_pi_mc,
+                   engine: str = DEFAULT_ENGINE,
+                   leibniz_mode: str = DEFAULT_LEIBNIZ_MODE,
+                   workers: int = DEFAULT_WORKERS,
+                   timing: str = DEFAULT_TIMING, clock_overhead: float = 0.0,
+                   autotuned: bool = False, sampler: str = DEFAULT_SAMPLER,
+                   sampler_samples: dict | None = None,
+                   leibniz_stats: StreamingStats | None = None,
+                   montecarlo_stats: StreamingStats | None = None,
+                   order: str = DEFAULT_ORDER, warmup: int = 0,
+                   order_stats: dict | None = None,
+                   stopping: str = DEFAULT_STOPPING,
+                   montecarlo_samples: StreamingStats | None = None,
+                   montecarlo_within: int | None = None, width: int = 60):
     lei_wins = trials - mc_wins
     mc_pct_wins = 100.0 * mc_wins / trials
     lei_pct_wins = 100.0 * lei_wins / trials
@@ -287,17 +2228,84 @@ def _print_results(trials, tolerance, mc_batch, med_leib, med_mc,
     )
     pl(
         f"Monte Carlo batch size "
-        f"{'(default)' if mc_batch == DEFAULT_MONTECARLO_BATCH else '[user input]'}",
+        f"{'[autotuned]' if autotuned else '(default)' if mc_batch == DEFAULT_MONTECARLO_BATCH else '[user input]'}",
         f"{mc_batch}"
     )
+    pl(
+        f"Leibniz mode {'(default)' if leibniz_mode == DEFAULT_LEIBNIZ_MODE else '[user input]'}",
+        leibniz_mode
+    )
+    pl(
+        f"Monte Carlo engine {'(default)' if engine == DEFAULT_ENGINE else '[user input]'}",
+        engine
+    )
+    pl(
+        f"Monte Carlo sampler {'(default)' if sampler == DEFAULT_SAMPLER else '[user input]'}",
+        sampler
+    )
+    pl(
+        f"Worker processes {'(default)' if workers == DEFAULT_WORKERS else '[user input]'}",
+        f"{workers}"
+    )
+    pl(
+        f"Timing mode {'(default)' if timing == DEFAULT_TIMING else '[user input]'}",
+        timing
+    )
+    pl(
+        f"Trial order {'(default)' if order == DEFAULT_ORDER else '[user input]'}",
+        order
+    )
+    pl(
+        f"Warmup trials {'(default)' if warmup == 0 else '[user input]'}",
+        f"{warmup}"
+    )
+    pl(
+        f"Stopping rule {'(default)' if stopping == DEFAULT_STOPPING else '[user input]'}",
+        stopping
+    )
+    pl("Clock read overhead (nanoseconds)", f"{clock_overhead * 1e9:.1f}")
     pl("Avg Leibniz time (microseconds)", f"{to_us(med_leib):.2f}")
     pl("Avg Monte Carlo time (microseconds)", f"{to_us(med_mc):.2f}")
     pl("% Monte Carlo wins", f"{mc_pct_wins:.2f}%")
     pl("% Leibniz wins", f"{lei_pct_wins:.2f}%")
+    if montecarlo_samples is not None:
+        pl("Median Monte Carlo samples used", f"{montecarlo_samples.quantile(0.5):,.0f}")
+        pl("Max Monte Carlo samples used", f"{montecarlo_samples.max:,.0f}")
+    if montecarlo_within is not None:
+        pl("% Monte Carlo runs within tolerance",
+           f"{100.0 * montecarlo_within / trials:.2f}%")
     pl("Final pi estimate (Leibniz)", f"{last_pi_lei:.9f}")
     pl("Final pi estimate (Monte Carlo)", f"{last_pi_mc:.9f}")
     print(seps)
 
+    if leibniz_stats is not None and montecarlo_stats is not None:
+        print("Trial time percentiles (microseconds)")
+        print(f"{'':<14}{'p50':>11}{'p90':>11}{'p99':>11}{'max':>11}")
+        for name, summary in (("Leibniz", leibniz_stats),
+                              ("Monte Carlo", montecarlo_stats)):
+            row = [summary.quantile(q) for q in REPORTED_QUANTILES]
+            row.append(summary.max)
+            print(f"  {name:<12}" + "".join(f"{to_us(v):>11.2f}" for v in row))
+        print(seps)
+
+    if order_stats and all(summary.count for summary in order_stats.values()):
+        print("Order effect (median microseconds when run first/second)")
+        print(f"{'':<14}{'first':>11}{'second':>11}{'bias':>11}")
+        for name, key in (("Leibniz", "leibniz"), ("Monte Carlo", "montecarlo")):
+            first = order_stats[f"{key}_first"].quantile(0.5)
+            second = order_stats[f"{key}_second"].quantile(0.5)
+            bias = 100.0 * (second - first) / max(first, 1e-15)
+            print(f"  {name:<12}{to_us(first):>11.2f}{to_us(second):>11.2f}"
+                  f"{bias:>+10.1f}%")
+        print(seps)
+
+    if sampler_samples:
+        print("Median Monte Carlo samples to tolerance, by sampler")
+        for name, samples in sampler_samples.items():
+            capped = "+" if samples >= SAMPLER_COMPARISON_MAX_SAMPLES else ""
+            pl(f"  {name}", f"{samples:,.0f}{capped}")
+        print(seps)
+
     conclusion = (
         f"Monte Carlo won {mc_wins}/{trials} trials.\n"
         f"Leibniz won {lei_wins}/{trials} trials.\n"
@@ -325,8 +2333,106 @@ def main():
     parser.add_argument(
         "--profile", action="store_true",
         help="Run cProfile before trials (default: off)")
+    parser.add_argument(
+        "--engine", choices=sorted(MONTECARLO_ENGINES), default=DEFAULT_ENGINE,
+        help="Monte Carlo sampling engine (default: python)")
+    parser.add_argument(
+        "--leibniz-mode", choices=("closed-form", *LEIBNIZ_GENERATORS),
+        default=DEFAULT_LEIBNIZ_MODE,
+        help="Leibniz stopping strategy (default: generator)")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Number of worker processes (default: 1, this machine has "
+             f"{os.cpu_count()} CPUs)")
+    parser.add_argument(
+        "--timing", choices=sorted(TIMING_CLOCKS), default=DEFAULT_TIMING,
+        help="Where trials read the clock (default: per-step)")
+    parser.add_argument(
+        "--store", default=DEFAULT_STORE,
+        help=f"JSON-lines file results are appended to (default: {DEFAULT_STORE})")
+    parser.add_argument(
+        "--no-store", action="store_true",
+        help="Do not save this run's results")
+    parser.add_argument(
+        "--compare", action="store_true",
+        help="Check this run against the previous stored run for slowdowns")
+    parser.add_argument(
+        "--autotune", action="store_true",
+        help="Pick the Monte Carlo batch size automatically (cached per host)")
+    parser.add_argument(
+        "--retune", action="store_true",
+        help="With --autotune, ignore the cached batch size and sweep again")
+    parser.add_argument(
+        "--sampler", choices=SAMPLERS, default=DEFAULT_SAMPLER,
+        help="Monte Carlo point sampler (default: random)")
+    parser.add_argument(
+        "--compare-samplers", action="store_true",
+        help="Also report samples-to-tolerance for every sampler")
+    parser.add_argument(
+        "--profiler", choices=("cprofile", "sampling"), default=DEFAULT_PROFILER,
+        help="Profiler used by --profile (default: cprofile)")
+    parser.add_argument(
+        "--profile-interval", type=float, default=DEFAULT_PROFILE_INTERVAL,
+        help="Seconds of CPU time between samples (sampling profiler)")
+    parser.add_argument(
+        "--collapsed-out", default=None,
+        help="Write sampled stacks in collapsed format for flame graphs")
+    parser.add_argument(
+        "--pstats-out", default=None,
+        help="Save raw cProfile statistics to this file")
+    parser.add_argument(
+        "--tournament", action="store_true",
+        help="Race every registered estimator instead of just two")
+    parser.add_argument(
+        "--methods", default=None,
+        help=f"Comma-separated estimators for --tournament "
+             f"(choices: {', '.join(ESTIMATORS)})")
+    parser.add_argument(
+        "--digits", type=int, default=None,
+        help="High-precision mode: decimal digits of pi to compute")
+    parser.add_argument(
+        "--order", choices=TRIAL_ORDERS, default=DEFAULT_ORDER,
+        help="Which method runs first in each trial (default: fixed)")
+    parser.add_argument(
+        "--warmup", type=int, default=0,
+        help="Untimed warmup trials before measuring (default: 0)")
+    parser.add_argument(
+        "--pin-cpu", type=int, default=None,
+        help="Pin the process to this CPU (Linux only)")
+    parser.add_argument(
+        "--mc-batched", action="store_true",
+        help="Simulate all Monte Carlo trials in one NumPy array pass")
+    parser.add_argument(
+        "--stopping", choices=sorted(STOPPING_POLICIES), default=DEFAULT_STOPPING,
+        help="Monte Carlo stopping rule (default: true-error)")
+    parser.add_argument(
+        "--confidence", type=float, default=DEFAULT_CONFIDENCE,
+        help="Confidence level for interval stopping rules (default: 0.95)")
+    parser.add_argument(
+        "--max-samples", type=int, default=None,
+        help="Cap on Monte Carlo samples per run (default: 20,000,000, "
+             "or each run's share of --pool)")
+    parser.add_argument(
+        "--make-pool", default=None,
+        help="Write a sample pool file of uniform doubles and exit")
+    parser.add_argument(
+        "--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+        help="Values written by --make-pool (default: 50,000,000)")
+    parser.add_argument(
+        "--pool", default=None,
+        help="Sample pool file for --engine pool")
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="Seed for --make-pool, --mc-batched and the worker RNG streams")
     args = parser.parse_args()
 
+    if args.make_pool:
+        if args.pool_size <= 0:
+            raise ValueError("--pool-size must be > 0")
+        write_sample_pool(args.make_pool, args.pool_size, args.seed)
+        print(f"Wrote {args.pool_size:,} uniform doubles to \"{args.make_pool}\"")
+        return
+
     # Edge cases, validation
     if args.montecarlo_batch <= 0:
         raise ValueError("--mc-batch or --montecarlo_batch must be > 0")
@@ -334,14 +2440,127 @@ def main():
         raise ValueError("--tolerance must be > 0")
     if args.trials <= 0:
         raise ValueError("--trials must be > 0")
+    if args.workers <= 0:
+        raise ValueError("--workers must be > 0")
+    if (args.collapsed_out or args.pstats_out) and not args.profile:
+        raise ValueError("--collapsed-out/--pstats-out need --profile")
+    if args.collapsed_out and args.profiler != "sampling":
+        raise ValueError("--collapsed-out needs --profiler sampling")
+    if args.pstats_out and args.profiler != "cprofile":
+        raise ValueError("--pstats-out needs --profiler cprofile")
+    if args.profiler == "sampling" and not hasattr(signal, "setitimer"):
+        raise ValueError("--profiler sampling needs a Unix system (SIGPROF)")
+    if args.profile_interval <= 0:
+        raise ValueError("--profile-interval must be > 0")
+    if args.methods is not None:
+        args.methods = [name.strip() for name in args.methods.split(",")]
+        unknown = [name for name in args.methods if name not in ESTIMATORS]
+        if unknown:
+            raise ValueError(f"Unknown --methods: {', '.join(unknown)}")
+        if not args.tournament:
+            raise ValueError("--methods needs --tournament")
+    if args.digits is not None and args.digits <= 0:
+        raise ValueError("--digits must be > 0")
+    if not 0 < args.confidence < 1:
+        raise ValueError("--confidence must be between 0 and 1")
+    if args.max_samples is not None and args.max_samples <= 0:
+        raise ValueError("--max-samples must be > 0")
+    if args.warmup < 0:
+        raise ValueError("--warmup must be >= 0")
+    if args.pin_cpu is not None:
+        if args.workers > 1:
+            raise ValueError("--pin-cpu needs --workers 1")
+        if not hasattr(os, "sched_setaffinity"):
+            raise ValueError("--pin-cpu needs os.sched_setaffinity (Linux)")
+        if args.pin_cpu not in os.sched_getaffinity(0):
+            raise ValueError(f"--pin-cpu {args.pin_cpu} is not an available CPU")
+    if args.mc_batched and np is None:
+        raise ValueError("--mc-batched requires NumPy (pip install numpy)")
+    if args.compare and args.no_store:
+        raise ValueError("--compare needs the result store (drop --no-store)")
+    if args.engine != "python" and args.sampler != "random":
+        raise ValueError("--sampler halton/sobol needs --engine python")
+    if args.engine == "pool":
+        if not args.pool:
+            raise ValueError("--engine pool needs --pool PATH (see --make-pool)")
+        if not os.path.isfile(args.pool):
+            raise ValueError(f"--pool file \"{args.pool}\" not found")
+        if args.autotune or args.profile:
+            raise ValueError("--autotune/--profile do not support --engine pool")
+        pool_values = os.path.getsize(args.pool) // 8
+        batch = args.montecarlo_batch
+        budget = pool_sample_budget(pool_values, trials=args.trials,
+                                    workers=args.workers, warmup=args.warmup,
+                                    batch_size=batch)
+        wanted = batch if args.max_samples is None else -(-args.max_samples // batch) * batch
+        if wanted > budget:
+            runs_per_worker = -(-args.trials // args.workers) + args.warmup
+            needed = 2 * wanted * runs_per_worker * args.workers
+            # a usage error, reported without a traceback
+            parser.error(
+                f"--pool \"{args.pool}\" holds {pool_values:,} values, "
+                f"{budget:,} samples per run; {args.trials:,} trials of "
+                f"{wanted:,} samples need at least {needed:,} values. Write a "
+                f"bigger pool with --make-pool --pool-size {needed} or run "
+                f"fewer --trials" + ("" if args.max_samples is None
+                                     else " / a lower --max-samples"))
+        pool_share = args.max_samples is None
+        if pool_share:
+            args.max_samples = budget
+    elif args.pool:
+        raise ValueError("--pool needs --engine pool")
+    if args.max_samples is None:
+        args.max_samples = DEFAULT_MAX_SAMPLES
+    if args.engine == "numpy" and np is None:
+        raise ValueError("--engine numpy requires NumPy (pip install numpy)")
 
     # Capture start time
     start_time = datetime.now()
     start_perf = time.perf_counter()
     _print_banner_start(start_time, args.profile, args)
 
-    run_trials(trials=args.trials, tolerance=args.tolerance,
-               montecarlo_batch=args.montecarlo_batch, profile=args.profile)
+    if args.pin_cpu is not None:
+        pin_to_cpu(args.pin_cpu)
+
+    if args.autotune:
+        args.montecarlo_batch, cached = autotune_batch_size(
+            tolerance=args.tolerance, engine=args.engine,
+            timing=args.timing, sampler=args.sampler, stopping=args.stopping,
+            confidence=args.confidence, max_samples=args.max_samples,
+            retune=args.retune)
+        print(f"Autotuned Monte Carlo batch size: {args.montecarlo_batch} "
+              f"({'cached' if cached else 'measured'})", flush=True)
+
+    if args.engine == "pool":
+        print(f"Monte Carlo sample cap per run: {args.max_samples:,} "
+              f"{'(pool share)' if pool_share else '[user input]'}", flush=True)
+
+    if args.digits is not None:
+        run_precision_trials(trials=args.trials, digits=args.digits,
+                             timing=args.timing)
+    elif args.mc_batched:
+        run_batched_montecarlo(trials=args.trials, tolerance=args.tolerance,
+                               batch_size=args.montecarlo_batch,
+                               max_samples=args.max_samples, seed=args.seed)
+    elif args.tournament:
+        run_tournament(trials=args.trials, tolerance=args.tolerance,
+                       methods=args.methods, timing=args.timing,
+                       montecarlo_batch=args.montecarlo_batch,
+                       sampler=args.sampler)
+    else:
+        run_trials(trials=args.trials, tolerance=args.tolerance,
+                   montecarlo_batch=args.montecarlo_batch, profile=args.profile,
+                   engine=args.engine, leibniz_mode=args.leibniz_mode,
+                   workers=args.workers, timing=args.timing,
+                   store=None if args.no_store else args.store,
+                   compare=args.compare, autotuned=args.autotune,
+                   sampler=args.sampler, profiler=args.profiler,
+                   profile_interval=args.profile_interval,
+                   collapsed_out=args.collapsed_out, pstats_out=args.pstats_out,
+                   order=args.order, warmup=args.warmup,
+                   stopping=args.stopping, confidence=args.confidence,
+                   max_samples=args.max_samples, pool_path=args.pool,
+                   seed=args.seed, compare_samplers=args.compare_samplers)
 
     # Capture end time
     end_time = datetime.now()
@@ -2,81 +2,1006 @@
 
 # Logs & Time assignment
 
+import argparse
+import gzip
+import heapq
+import json
+import math
+import os
+import re
 import sys
-from datetime import datetime
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from hashlib import blake2b
+from itertools import count
 
+EPOCH = datetime(1970, 1, 1)
 
-def parse_timestamp(line, timefmt):
+ACCESS_LOG_TIMEFMT = "%d/%b/%Y:%H:%M:%S %z"
+MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+SIXTY = frozenset(f"{n:02d}" for n in range(60))  # valid minutes/seconds
+HOUR_CACHE_SIZE = 4096
+DEFAULT_LOG = "/var/www/logs/access_log"
+DEFAULT_WORKERS = 1
+BLOCK_SIZE = 1 << 20  # bytes read from the log at a time
+FOLLOW_POLL_SECONDS = 1.0
+DEFAULT_REORDER_SECONDS = 60
+DEFAULT_TOP_PATHS = 5
+HEAVY_HITTER_SLOTS = 10  # counters kept per top path reported
+HLL_PRECISION = 12  # 4096 one-byte registers, about 1.6% standard error
+HLL_SPARSE_LIMIT = 48  # exact hashes kept before a set outgrows the registers
+INDEX_EVERY = 1000  # lines between sparse index entries
+INDEX_SUFFIX = ".idx"
+# "GET /index.html HTTP/1.1" 302 207  ->  method, path, status, bytes sent
+REQUEST_RE = re.compile(rb'"([A-Z]+) ([^ "]*)[^"]*" (\d{3}) (\d+|-)')
+GRANULARITIES = {"minute": 60, "hour": 3600, "day": 86400}
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}  # for --by 15m, 6h, ...
+
+# "09/Oct/2025:14" + " -0700" -> (datetime, local epoch, UTC offset) of that hour
+_hour_cache = {}
+
+
+def _bracketed(line):
     # sample acces log entry:
     # 134.209.238.29 - - [09/Oct/2025:14:49:19 -0700] "GET / HTTP/1.0" 302 207 "-" "-"
 
+    if isinstance(line, bytes):
+        left_bracket = line.find(b"[")
+        right_bracket = line.find(b"]", left_bracket + 1)
+        if left_bracket < 0 or right_bracket < 0:
+            return None
+        # only the timestamp is decoded, never the rest of the line
+        return line[left_bracket + 1: right_bracket].decode("utf-8", errors="replace")
+
     left_bracket = line.find("[")
     right_bracket = line.find("]", left_bracket + 1)
 
     if left_bracket < 0 or right_bracket < 0:
         return None
-    date_str = line[left_bracket + 1: right_bracket]
+    return line[left_bracket + 1: right_bracket]
+
+
+def _strptime(date_str, timefmt):
     try:
         return datetime.strptime(date_str, timefmt)
     except ValueError:
         return None
 
 
-def access_counts_by_hour(my_lines, timefmt):
-    """Lazy and pure generator only"""
+def _access_log_hour(date_str):
+    """
+    Fast path for ACCESS_LOG_TIMEFMT: slice the fixed offsets of
+    "09/Oct/2025:14:49:19 -0700" instead of calling strptime. Returns
+    (datetime of the hour, its local-time epoch seconds, UTC offset
+    seconds), or None if the string looks irregular (the caller then
+    falls back to strptime).
+    """
+    if (len(date_str) != 26 or date_str[2] != "/" or date_str[6] != "/"
+            or date_str[11] != ":" or date_str[14] != ":"
+            or date_str[17] != ":" or date_str[20] != " "
+            or date_str[15:17] not in SIXTY or date_str[18:20] not in SIXTY
+            or date_str[24:26] not in SIXTY):
+        return None
+
+    # every line of the same hour shares this key, so it is parsed once
+    key = date_str[:14] + date_str[20:]
+    cached = _hour_cache.get(key)
+    if cached is not None:
+        return cached
+
+    day, month, year = date_str[0:2], date_str[3:6], date_str[7:11]
+    hh, sign, tz_hh, tz_mm = date_str[12:14], date_str[21], date_str[22:24], date_str[24:26]
+    if (month not in MONTHS or sign not in "+-"
+            or not (day + year + hh + tz_hh + tz_mm).isdigit()):
+        return None
+    offset = timedelta(hours=int(tz_hh), minutes=int(tz_mm))
+    if sign == "-":
+        offset = -offset
+    try:
+        hour = datetime(int(year), MONTHS[month], int(day), int(hh),
+                        tzinfo=timezone(offset))
+    except ValueError:
+        return None
+    cached = (hour, (hour.replace(tzinfo=None) - EPOCH) // timedelta(seconds=1),
+              offset // timedelta(seconds=1))
+
+    if len(_hour_cache) >= HOUR_CACHE_SIZE:
+        _hour_cache.clear()
+    _hour_cache[key] = cached
+    return cached
+
+
+def parse_timestamp(line, timefmt):
+    date_str = _bracketed(line)
+    if date_str is None:
+        return None
+    if timefmt == ACCESS_LOG_TIMEFMT:
+        cached = _access_log_hour(date_str)
+        if cached is not None:
+            return cached[0].replace(minute=int(date_str[15:17]),
+                                     second=int(date_str[18:20]))
+    return _strptime(date_str, timefmt)
+
+
+def parse_hour(line, timefmt):
+    """parse_timestamp truncated to the hour; skips parsing on a cache hit"""
+    date_str = _bracketed(line)
+    if date_str is None:
+        return None
+    if timefmt == ACCESS_LOG_TIMEFMT:
+        cached = _access_log_hour(date_str)
+        if cached is not None:
+            return cached[0]
+    time_stamp = _strptime(date_str, timefmt)
+    if time_stamp is None:
+        return None
+    return time_stamp.replace(minute=0, second=0, microsecond=0)
+
+
+def parse_local_epoch(line, timefmt):
+    """
+    (local-time epoch seconds, UTC offset seconds) of a line, or None.
+    Local epoch counts wall-clock seconds in the log's own time zone,
+    so buckets built on it start at the log's midnight, not UTC's.
+    """
+    date_str = _bracketed(line)
+    if date_str is None:
+        return None
+    if timefmt == ACCESS_LOG_TIMEFMT:
+        cached = _access_log_hour(date_str)
+        if cached is not None:
+            return (cached[1] + int(date_str[15:17]) * 60 + int(date_str[18:20]),
+                    cached[2])
+    time_stamp = _strptime(date_str, timefmt)
+    if time_stamp is None:
+        return None
+    offset = time_stamp.utcoffset() or timedelta(0)
+    local = time_stamp.replace(tzinfo=None) - EPOCH
+    return local // timedelta(seconds=1), offset // timedelta(seconds=1)
+
+
+def bucket_width(name):
+    """Seconds in a --by bucket: minute, hour, day, or e.g. 15m, 6h, 30s, 7d"""
+    if name in GRANULARITIES:
+        return GRANULARITIES[name]
+    number, unit = name[:-1], name[-1:]
+    if unit not in UNIT_SECONDS or not number.isdigit() or int(number) == 0:
+        raise ValueError(f"Unknown bucket width \"{name}\" "
+                         f"(use minute, hour, day or e.g. 15m, 6h)")
+    return int(number) * UNIT_SECONDS[unit]
+
+
+def utc_keyed(width):
+    """
+    Whether buckets of this width are keyed by the UTC epoch of their start
+    rather than the local one. Buckets are always aligned in local time,
+    but at a DST fall-back the repeated hour must stay two buckets, while
+    a day (or 6h, ...) is one bucket that just holds an extra hour.
+    """
+    return width <= GRANULARITIES["hour"]
+
+
+def access_rollups(my_lines, timefmt, widths, clients=False):
+    """
+    Count accesses into buckets of every width in widths (seconds) in a
+    single pass. Returns {width: (counts, offsets, sketches)}, where the
+    dicts are keyed by the epoch of the bucket start (UTC or local, see
+    utc_keyed), offsets holds the UTC offset of the first line seen in
+    the bucket (for printing) and sketches a HyperLogLog of its clients
+    (only if clients is set).
+    """
+    rollups = {width: ({}, {}, {}) for width in widths}
+    tables = [(width, utc_keyed(width), *tables) for width, tables in rollups.items()]
+    for line in my_lines:
+        parsed = parse_local_epoch(line, timefmt)
+        if parsed is None:
+            continue
+        local, offset = parsed
+        hashed = HyperLogLog.hash(client_of(line)) if clients else None
+        for width, utc, counts, offsets, sketches in tables:
+            key = local - local % width - (offset if utc else 0)
+            count = counts.get(key)
+            if count is None:
+                counts[key] = 1
+                offsets[key] = offset
+                if clients:
+                    sketches[key] = HyperLogLog()
+            else:
+                counts[key] = count + 1
+            if clients:
+                sketches[key].add_hash(hashed)
+    return rollups
+
+
+def merge_rollups(rollups, other):
+    """Add the counts (and client sketches) of other into rollups (same widths)"""
+    for width, (counts, offsets, sketches) in other.items():
+        merged_counts, merged_offsets, merged_sketches = rollups[width]
+        for key, count in counts.items():
+            merged_counts[key] = merged_counts.get(key, 0) + count
+            merged_offsets.setdefault(key, offsets[key])
+        for key, sketch in sketches.items():
+            if key in merged_sketches:
+                merged_sketches[key].merge(sketch)
+            else:
+                merged_sketches[key] = sketch
+    return rollups
+
+
+def client_of(line):
+    """The client address that starts an access log line, as bytes"""
+    if isinstance(line, str):
+        line = line.encode("utf-8", errors="replace")
+    end = line.find(b" ")
+    return line if end < 0 else line[:end]
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating how many distinct items were added,
+    in 2**precision one-byte registers (4 KB by default). Items are
+    hashed with blake2b rather than hash(), which is salted per process,
+    so sketches built in different worker processes can be merged.
+    Up to HLL_SPARSE_LIMIT items are kept as an exact set of hashes, so
+    the many small buckets of e.g. --by minute stay small (and exact).
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.hashes = set()  # None once switched to the registers
+        self.registers = None
+
+    @staticmethod
+    def hash(item):
+        return int.from_bytes(blake2b(item, digest_size=8).digest(), "big")
+
+    def add_hash(self, hashed):
+        hashes = self.hashes
+        if hashes is not None:
+            hashes.add(hashed)
+            if len(hashes) > HLL_SPARSE_LIMIT:
+                self._densify()
+            return
+        # the first bits pick a register, which keeps the longest run of
+        # leading zeros (+1) seen in the remaining bits
+        rest_bits = 64 - self.precision
+        index = hashed >> rest_bits
+        rank = rest_bits - (hashed & ((1 << rest_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, item):
+        self.add_hash(self.hash(item))
+
+    def _densify(self):
+        hashes, self.hashes = self.hashes, None
+        self.registers = bytearray(1 << self.precision)
+        for hashed in hashes:
+            self.add_hash(hashed)
+
+    def merge(self, other):
+        """Union of two sketches (e.g. from worker chunks or other logs)"""
+        if other.hashes is not None:
+            for hashed in other.hashes:
+                self.add_hash(hashed)
+            return self
+        if self.hashes is not None:
+            self._densify()
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self):
+        if self.hashes is not None:
+            return len(self.hashes)
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0 ** -rank for rank in self.registers)
+        empty = self.registers.count(0)
+        if raw <= 2.5 * size and empty:
+            # few items: linear counting on the empty registers is more accurate
+            return round(size * math.log(size / empty))
+        return round(raw)
+
+
+class HeavyHitters:
+    """
+    Misra-Gries summary of the most frequent items in a stream, using at
+    most `capacity` counters however many distinct items there are.
+    Counts are lower bounds, each at most total / (capacity + 1) too low.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.total = 0
+
+    def add(self, item):
+        self.total += 1
+        counts = self.counts
+        if item in counts:
+            counts[item] += 1
+        elif len(counts) < self.capacity:
+            counts[item] = 1
+        else:
+            # no free counter: decrement them all and drop the ones at zero
+            for key in list(counts):
+                if counts[key] == 1:
+                    del counts[key]
+                else:
+                    counts[key] -= 1
+
+    def merge(self, other):
+        """Combine two summaries (e.g. from worker chunks)"""
+        self.total += other.total
+        for item, item_count in other.counts.items():
+            self.counts[item] = self.counts.get(item, 0) + item_count
+        if len(self.counts) > self.capacity:
+            # subtract the (capacity + 1)-th largest count to stay in bounds
+            cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {item: item_count - cut
+                           for item, item_count in self.counts.items()
+                           if item_count > cut}
+        return self
+
+    def top(self, n):
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+def _new_breakdown(top_n, clients):
+    return {"count": 0, "bytes": 0, "status": {}, "methods": {},
+            "paths": HeavyHitters(top_n * HEAVY_HITTER_SLOTS),
+            "clients": HyperLogLog() if clients else None}
+
+
+def access_breakdowns(my_lines, timefmt, top_n=DEFAULT_TOP_PATHS, clients=False):
+    """
+    Per hour: accesses, bytes sent, counts per status class (2xx, ...)
+    and per method, and the approximate top paths, from one compiled
+    regex match per line. Returns (breakdowns, offsets) keyed by the UTC
+    epoch of the hour like access_rollups. Method, path and status stay bytes.
+    """
+    breakdowns = {}
+    offsets = {}
+    for line in my_lines:
+        parsed = parse_local_epoch(line, timefmt)
+        if parsed is None:
+            continue
+        local, offset = parsed
+        key = local - local % GRANULARITIES["hour"] - offset
+        breakdown = breakdowns.get(key)
+        if breakdown is None:
+            breakdown = breakdowns[key] = _new_breakdown(top_n, clients)
+            offsets[key] = offset
+        breakdown["count"] += 1
+        if clients:
+            breakdown["clients"].add(client_of(line))
+
+        match = REQUEST_RE.search(line)
+        if match is None:
+            continue
+        method, path, status, sent = match.groups()
+        status_class = status[:1]
+        breakdown["status"][status_class] = breakdown["status"].get(status_class, 0) + 1
+        breakdown["methods"][method] = breakdown["methods"].get(method, 0) + 1
+        breakdown["paths"].add(path)
+        if sent != b"-":
+            breakdown["bytes"] += int(sent)
+    return breakdowns, offsets
+
+
+def merge_breakdowns(merged, other):
+    """Add the (breakdowns, offsets) of other into merged"""
+    breakdowns, offsets = merged
+    for key, breakdown in other[0].items():
+        if key not in breakdowns:
+            breakdowns[key] = breakdown
+            offsets[key] = other[1][key]
+            continue
+        into = breakdowns[key]
+        into["count"] += breakdown["count"]
+        into["bytes"] += breakdown["bytes"]
+        for field in ("status", "methods"):
+            for item, item_count in breakdown[field].items():
+                into[field][item] = into[field].get(item, 0) + item_count
+        into["paths"].merge(breakdown["paths"])
+        if into["clients"] is not None:
+            into["clients"].merge(breakdown["clients"])
+    return merged
+
+
+def access_counts_by_hour(my_lines, timefmt, clients=False):
+    """
+    Lazy and pure generator only. A None in my_lines (see follow_lines)
+    means "caught up", and re-emits the current hour's running count.
+    With clients, rows are (hour, count, estimated distinct clients).
+    """
     current_hour = None
     current_count = 0
+    emitted_count = 0
+    shown = False  # current count was already emitted on catching up
+    sketch = None
+
+    def row():
+        if clients:
+            return current_hour, current_count, sketch.estimate()
+        return current_hour, current_count
 
     for line in my_lines:
-        time_stamp = parse_timestamp(line, timefmt)
-        if time_stamp is None:
+        if line is None:
+            if current_hour is not None and current_count != emitted_count:
+                emitted_count = current_count
+                shown = True
+                yield row()
+            continue
+        hour = parse_hour(line, timefmt)
+        if hour is None:
             continue
-        hour = time_stamp.replace(minute=0, second=0, microsecond=0)
 
         if current_hour is None:
             current_hour = hour
-            current_count = 1
-            yield current_hour, current_count
+            current_count = emitted_count = 1
+            if clients:
+                sketch = HyperLogLog()
+                sketch.add(client_of(line))
+            yield row()
             continue
 
         if hour == current_hour:
             current_count += 1
+            shown = False
+            if clients:
+                sketch.add(client_of(line))
         else:
             # finalize previous hour
-            yield current_hour, current_count
+            if not shown:
+                yield row()
             # start new hour and emit immediately
             current_hour, current_count = hour, 1
-            yield current_hour, current_count
+            emitted_count = 1
+            shown = False
+            if clients:
+                sketch = HyperLogLog()
+                sketch.add(client_of(line))
+            yield row()
 
     # flush last partial hour
-    if current_hour is not None:
-        yield current_hour, current_count
+    if current_hour is not None and not shown:
+        yield row()
+
+
+def follow_lines(file_path, poll_seconds=FOLLOW_POLL_SECONDS):
+    """
+    Like tail -f: yield the lines of file_path, then keep yielding lines
+    as they are appended. Yields None each time it catches up with the
+    end of the file, then sleeps poll_seconds between checks (no busy
+    loop). On a new inode at file_path (log rotation) the old file is
+    read to its end, then the new one is read from the start; a file
+    that shrank (truncation) is re-read from the start.
+    """
+    my_file = open(file_path, "rb", buffering=BLOCK_SIZE)
+    partial = b""
+    caught_up = False
+    try:
+        while True:
+            line = my_file.readline()
+            if line.endswith(b"\n"):
+                caught_up = False
+                yield partial + line
+                partial = b""
+                continue
+            partial += line  # incomplete last line, wait for the rest
+
+            if not caught_up:
+                caught_up = True
+                yield None
+            time.sleep(poll_seconds)
+            try:
+                current = os.stat(file_path)
+            except FileNotFoundError:
+                continue  # rotated away, new file not created yet
+            if current.st_ino != os.fstat(my_file.fileno()).st_ino:
+                # finish the old file first: lines may have been appended
+                # to it while we slept, and it will get no newline now
+                for line in my_file:
+                    if line.endswith(b"\n"):
+                        yield partial + line
+                        partial = b""
+                    else:
+                        partial += line
+                if partial:
+                    yield partial
+                my_file.close()
+                my_file = open(file_path, "rb", buffering=BLOCK_SIZE)
+                partial = b""
+                caught_up = False
+            elif current.st_size < my_file.tell():
+                my_file.seek(0)
+                partial = b""
+    finally:
+        my_file.close()
+
+
+def open_log(file_path):
+    """Open a log for binary reading; .gz logs are decompressed as they are read"""
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rb")
+    return open(file_path, "rb", buffering=BLOCK_SIZE)
+
+
+def chained_lines(file_paths):
+    """The lines of several logs, one log after the other"""
+    for file_path in file_paths:
+        with open_log(file_path) as my_file:
+            yield from my_file
+
+
+def _timed_lines(file_path, timefmt, window):
+    """
+    (UTC epoch, order, line) for each timestamped line of one log, put
+    back in time order: a line is held until a line `window` seconds
+    newer has been read. Lines later than that are still yielded, just
+    out of order.
+    """
+    held = []
+    order = count()
+    newest = None
+    with open_log(file_path) as my_file:
+        for line in my_file:
+            parsed = parse_local_epoch(line, timefmt)
+            if parsed is None:
+                continue
+            moment = parsed[0] - parsed[1]
+            heapq.heappush(held, (moment, next(order), line))
+            if newest is None or moment > newest:
+                newest = moment
+            while held[0][0] <= newest - window:
+                yield heapq.heappop(held)
+    while held:
+        yield heapq.heappop(held)
+
+
+def merged_lines(file_paths, timefmt, window=DEFAULT_REORDER_SECONDS):
+    """
+    The timestamped lines of several logs (e.g. one per web server,
+    plain or .gz) as one time-ordered stream: a k-way heap merge of
+    the per-file streams, each reordered within `window` seconds.
+    """
+    streams = [_timed_lines(file_path, timefmt, window) for file_path in file_paths]
+    for _, _, line in heapq.merge(*streams):
+        yield line
+
+
+def _index_lines(file_path, start, index, timefmt):
+    """Append entries for the complete lines from byte `start` on to index"""
+    entries = index["entries"]
+    newest = entries[-1][0] if entries else None
+    since_entry = index["every"]  # the first timestamped line gets an entry
+    position = start
+    with open(file_path, "rb", buffering=BLOCK_SIZE) as my_file:
+        my_file.seek(start)
+        for line in my_file:
+            if not line.endswith(b"\n"):
+                break  # still being written; indexed on the next update
+            parsed = parse_local_epoch(line, timefmt)
+            if parsed is not None:
+                moment = parsed[0] - parsed[1]
+                if index["offset"] is None:
+                    index["offset"] = parsed[1]
+                # keys are the newest time so far, so they stay sorted for bisect
+                newest = moment if newest is None else max(newest, moment)
+                if since_entry >= index["every"]:
+                    entries.append([newest, position])
+                    since_entry = 0
+            since_entry += 1
+            position += len(line)
+    index["size"] = position
+
+
+def load_index(file_path, timefmt, index_path=None, every=INDEX_EVERY,
+               fallback=True):
+    """
+    The sparse sidecar index of a log (index_path, by default file_path +
+    ".idx"): the byte offset of every `every`-th line, keyed by UTC epoch.
+    A log that only grew since the index was written has its new lines
+    indexed; a log that was replaced (new inode) or shrank is indexed from
+    scratch. If the index cannot be written it is only kept in memory for
+    this run (with a warning), or the OSError is raised without fallback.
+    """
+    if index_path is None:
+        index_path = file_path + INDEX_SUFFIX
+    status = os.stat(file_path)
+    try:
+        with open(index_path, "r", encoding="utf-8") as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        index = None
+    if index is not None and index["size"] == status.st_size and index["inode"] == status.st_ino:
+        return index
+
+    if (index is None or index["inode"] != status.st_ino
+            or index["size"] > status.st_size or index["every"] != every):
+        index = {"inode": status.st_ino, "size": 0, "every": every,
+                 "offset": None, "entries": []}
+    _index_lines(file_path, index["size"], index, timefmt)
+    try:
+        with open(index_path, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file)
+    except OSError as err:
+        if not fallback:
+            raise
+        # e.g. a read-only log directory: the index still narrows this scan
+        print(f'Could not write index "{index_path}" ({err.strerror}); '
+              "keeping it in memory for this run", file=sys.stderr)
+    return index
+
+
+def indexed_lines(file_path, index, timefmt, since=None, until=None,
+                  window=DEFAULT_REORDER_SECONDS):
+    """
+    The lines of a log with since <= UTC epoch < until. Its index (see
+    load_index) is binary-searched for the byte range that can hold them
+    (widened by `window` seconds for slightly out-of-order lines), and
+    only that slice of the log is read.
+    """
+    entries = index["entries"]
+    keys = [entry[0] for entry in entries]
+    start, end = 0, os.path.getsize(file_path)
+    if since is not None:
+        position = bisect_left(keys, since - window) - 1
+        start = entries[position][1] if position >= 0 else 0
+    if until is not None:
+        position = bisect_right(keys, until + window)
+        if position < len(entries):
+            end = entries[position][1]
+
+    for line in _read_range(file_path, start, end):
+        parsed = parse_local_epoch(line, timefmt)
+        if parsed is None:
+            continue
+        moment = parsed[0] - parsed[1]
+        if (since is None or moment >= since) and (until is None or moment < until):
+            yield line
+
+
+def window_epoch(moment, index):
+    """
+    UTC epoch of a --since/--until datetime. Times without a UTC offset
+    are taken in the log's own time zone (that of its first line, as
+    recorded in its index).
+    """
+    if moment.tzinfo is None:
+        offset = index["offset"] or 0
+        moment = moment.replace(tzinfo=timezone(timedelta(seconds=offset)))
+    return int(moment.timestamp())
+
+
+def chunk_ranges(file_path, n_chunks):
+    """Split a file into n_chunks (start, end) byte ranges that begin on a line"""
+    size = os.path.getsize(file_path)
+    starts = [0]
+    with open(file_path, "rb") as my_file:
+        for i in range(1, n_chunks):
+            # back up one byte so a line starting exactly here is not skipped
+            my_file.seek(max(size * i // n_chunks - 1, starts[-1]))
+            my_file.readline()
+            starts.append(max(my_file.tell(), starts[-1]))
+    starts.append(size)
+    return [(a, b) for a, b in zip(starts, starts[1:]) if a < b]
+
+
+def _read_range(file_path, start, end, block_size=BLOCK_SIZE):
+    """Undecoded lines starting in [start, end), read in large blocks"""
+    with open(file_path, "rb") as my_file:
+        my_file.seek(start)
+        position = start  # where the next line starts
+        tail = b""
+        while position < end:
+            block = my_file.read(block_size)
+            if not block:
+                break
+            lines = (tail + block).split(b"\n")
+            tail = lines.pop()  # partial line, completed by the next block
+            for line in lines:
+                if position >= end:
+                    return
+                position += len(line) + 1
+                yield line
+        if tail and position < end:
+            yield tail
+
+
+def _count_chunk(file_path, start, end, timefmt, clients=False):
+    """Worker: the ordered [hour, count, client sketch or None] runs of one byte range"""
+    runs = []
+    for line in _read_range(file_path, start, end):
+        hour = parse_hour(line, timefmt)
+        if hour is None:
+            continue
+        if runs and runs[-1][0] == hour:
+            runs[-1][1] += 1
+        else:
+            runs.append([hour, 1, HyperLogLog() if clients else None])
+        if clients:
+            runs[-1][2].add(client_of(line))
+    return runs
+
+
+def access_counts_parallel(file_path, timefmt, workers, clients=False):
+    """
+    Count accesses per hour with a pool of worker processes, one per
+    newline-aligned byte range. An hour cut in two by a chunk boundary
+    is joined back together, so the totals match access_counts_by_hour.
+    Only final counts are yielded (no running count for a new hour).
+    """
+    def row(run):
+        hour, count, sketch = run
+        return (hour, count, sketch.estimate()) if clients else (hour, count)
+
+    ranges = chunk_ranges(file_path, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(_count_chunk, [file_path] * len(ranges),
+                          *zip(*ranges), [timefmt] * len(ranges),
+                          [clients] * len(ranges))
+        pending = None
+        for runs in chunks:
+            for run in runs:
+                if pending is not None and pending[0] == run[0]:
+                    pending[1] += run[1]
+                    if clients:
+                        pending[2].merge(run[2])
+                    continue
+                if pending is not None:
+                    yield row(pending)
+                pending = run
+        if pending is not None:
+            yield row(pending)
+
+
+def _rollup_chunk(file_path, start, end, timefmt, widths, clients=False):
+    """Worker: access_rollups of one byte range"""
+    return access_rollups(_read_range(file_path, start, end), timefmt, widths, clients)
+
+
+def access_rollups_parallel(file_path, timefmt, widths, workers, clients=False):
+    """access_rollups with one worker process per newline-aligned byte range"""
+    ranges = chunk_ranges(file_path, workers)
+    rollups = {width: ({}, {}, {}) for width in widths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_rollup_chunk, [file_path] * len(ranges),
+                              *zip(*ranges), [timefmt] * len(ranges),
+                              [widths] * len(ranges), [clients] * len(ranges)):
+            merge_rollups(rollups, chunk)
+    return rollups
+
+
+def _breakdown_chunk(file_path, start, end, timefmt, top_n, clients=False):
+    """Worker: access_breakdowns of one byte range"""
+    return access_breakdowns(_read_range(file_path, start, end), timefmt, top_n, clients)
+
+
+def access_breakdowns_parallel(file_path, timefmt, top_n, workers, clients=False):
+    """access_breakdowns with one worker process per newline-aligned byte range"""
+    ranges = chunk_ranges(file_path, workers)
+    merged = ({}, {})
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_breakdown_chunk, [file_path] * len(ranges),
+                              *zip(*ranges), [timefmt] * len(ranges),
+                              [top_n] * len(ranges), [clients] * len(ranges)):
+            merge_breakdowns(merged, chunk)
+    return merged
+
+
+def print_breakdowns(breakdowns, offsets, top_n):
+    """Print each hour's count followed by its breakdown lines"""
+    def listing(items):
+        return ", ".join(f"{item.decode(errors='replace')} {item_count:,}"
+                         for item, item_count in items)
+
+    counts = {key: breakdown["count"] for key, breakdown in breakdowns.items()}
+    rows = rollup_rows(counts, offsets)
+    for key, (hour, count) in zip(sorted(counts), rows):
+        breakdown = breakdowns[key]
+        print(f"{hour:%Y-%m-%d %H:%M:%S %z} {count:4d} "
+              f"access{'es' if count != 1 else ''}")
+        if breakdown["clients"] is not None:
+            print(f"    clients: ~{breakdown['clients'].estimate():,}")
+        status = sorted(breakdown["status"].items())
+        print(f"    status:  {', '.join(f'{code.decode()}xx {n:,}' for code, n in status)}")
+        print(f"    bytes:   {breakdown['bytes']:,}")
+        methods = sorted(breakdown["methods"].items(), key=lambda item: (-item[1], item[0]))
+        print(f"    methods: {listing(methods)}")
+        print(f"    paths:   {listing(breakdown['paths'].top(top_n))}", flush=True)
+
+
+def print_counts(counts, day_breaks=True):
+    """
+    Print (datetime, count) rows, or (datetime, count, clients) rows,
+    with a blank line between days
+    """
+    previous_date = None
+    for hour, count, *clients in counts:
+        # print a blank line to make it clear we've transitioned to a new day
+        if day_breaks and previous_date and hour.date() != previous_date:
+            print()
+        print(
+            f"{hour:%Y-%m-%d %H:%M:%S %z} {count:4d} "
+            f"access{'es' if count != 1 else ''}"
+            + (f"  ~{clients[0]:,} client{'s' if clients[0] != 1 else ''}" if clients else ""),
+            flush=True,
+        )
+        previous_date = hour.date()
+
+
+def rollup_rows(counts, offsets, sketches=None, width=GRANULARITIES["hour"]):
+    """(datetime, count[, clients]) rows of one rollup table, in time order"""
+    utc = utc_keyed(width)
+    for key in sorted(counts):
+        offset = timedelta(seconds=offsets[key])
+        local = EPOCH + timedelta(seconds=key) + (offset if utc else timedelta())
+        start = local.replace(tzinfo=timezone(offset))
+        if sketches:
+            yield start, counts[key], sketches[key].estimate()
+        else:
+            yield start, counts[key]
 
 
 def main():
-    file_path = sys.argv[1] if len(sys.argv) > 1 else "/var/www/logs/access_log"
-    access_log_timefmt = "%d/%b/%Y:%H:%M:%S %z"
+    parser = argparse.ArgumentParser(description="Count web server accesses per hour")
+    parser.add_argument("file_paths", nargs="*", default=[DEFAULT_LOG],
+                        help=f"Access logs to read, plain or .gz; several logs are "
+                             f"merged into one series (default: {DEFAULT_LOG})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Processes to split the file over (default: 1)")
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep counting lines appended to the log (like tail -f)")
+    parser.add_argument("--by", default=None,
+                        help="Comma-separated bucket widths counted in one pass: "
+                             "minute, hour, day or e.g. 15m, 6h (default: a running "
+                             "count per hour)")
+    parser.add_argument("--breakdown", action="store_true",
+                        help="Also break each hour down by status class, bytes sent, "
+                             "method and top paths")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_PATHS,
+                        help="Paths listed per hour by --breakdown; counts are "
+                             f"approximate lower bounds (default: {DEFAULT_TOP_PATHS})")
+    parser.add_argument("--clients", action="store_true",
+                        help="Also estimate distinct client addresses per bucket "
+                             f"(exact up to {HLL_SPARSE_LIMIT}, then HyperLogLog with "
+                             "about 1.6%% error)")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None,
+                        help="Only count accesses from this time on, e.g. "
+                             "\"2025-10-09 14:00\" (log's time zone unless given); "
+                             "uses a sidecar index (see --index-path) instead of "
+                             "a full scan")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None,
+                        help="Only count accesses before this time (see --since)")
+    parser.add_argument("--index", action="store_true",
+                        help="Build or update the sidecar index and exit")
+    parser.add_argument("--index-path", default=None,
+                        help=f"Where the sidecar index is kept (default: "
+                             f"LOG{INDEX_SUFFIX} next to the log; if that cannot be "
+                             "written the index is only kept in memory)")
+    parser.add_argument("--reorder-window", type=int, default=None,
+                        help="Seconds by which lines may be out of order "
+                             f"(default: {DEFAULT_REORDER_SECONDS} when merging "
+                             "several or .gz logs)")
+    args = parser.parse_args()
+    file_paths = args.file_paths
+    file_path = file_paths[0]
+    index_path = args.index_path or file_path + INDEX_SUFFIX
+    # several logs, or compressed ones, are read through the heap merge
+    merging = (len(file_paths) > 1 or file_path.endswith(".gz")
+               or args.reorder_window is not None)
+    window = DEFAULT_REORDER_SECONDS if args.reorder_window is None else args.reorder_window
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if window < 0:
+        parser.error("--reorder-window must be >= 0")
+    if (args.follow or args.workers > 1) and (len(file_paths) > 1 or file_path.endswith(".gz")):
+        parser.error("--follow and --workers need a single uncompressed log")
+    if args.follow and args.workers > 1:
+        parser.error("--follow reads the log with a single process")
+    windowed = args.since is not None or args.until is not None
+    if (windowed or args.index) and (len(file_paths) > 1 or file_path.endswith(".gz")
+                                     or args.follow or args.workers > 1):
+        parser.error("--since/--until/--index need a single uncompressed log, "
+                     "without --follow or --workers")
+    if args.index_path is not None and not (windowed or args.index):
+        parser.error("--index-path is only used with --since/--until/--index")
+    if args.top < 1:
+        parser.error("--top must be >= 1")
+    if args.breakdown and (args.by or args.follow):
+        parser.error("--breakdown cannot be combined with --by or --follow")
+    widths = {}
+    if args.by:
+        if args.follow:
+            parser.error("--by cannot be combined with --follow")
+        try:
+            widths = {name: bucket_width(name) for name in args.by.split(",")}
+        except ValueError as err:
+            parser.error(str(err))
 
     try:
-        with open(file_path, "r", encoding="utf-8", errors="replace") as my_file:
-            previous_date = None
-            for hour, count in access_counts_by_hour(my_file, access_log_timefmt):
-                # print a blank line to make it clear we've transitioned to a new day
-                if previous_date and hour.date() != previous_date:
-                    print()
-                print(
-                    f"{hour:%Y-%m-%d %H:%M:%S %z} {count:4d} "
-                    f"access{'es' if count != 1 else ''}",
-                    flush=True,
-                )
-                previous_date = hour.date()
-        print(f'\nName of file read: "{file_path}"\n')
+        if args.index:
+            try:
+                index = load_index(file_path, ACCESS_LOG_TIMEFMT, index_path,
+                                   fallback=False)
+            except OSError as err:
+                if err.filename != index_path:
+                    raise  # the log itself, reported below
+                print(f'\nCould not write index "{index_path}": {err.strerror}\n')
+                return
+            print(f'Indexed {len(index["entries"]):,} entries of "{file_path}" '
+                  f'in "{index_path}"')
+            return
+
+        # binary mode: lines are scanned as bytes instead of decoded
+        with open_log(file_path) as my_file:
+            if windowed:
+                index = load_index(file_path, ACCESS_LOG_TIMEFMT, index_path)
+                since, until = (None if moment is None else window_epoch(moment, index)
+                                for moment in (args.since, args.until))
+                # only the slice of the log the index points to is read
+                lines = indexed_lines(file_path, index, ACCESS_LOG_TIMEFMT,
+                                      since, until, window)
+            elif len(file_paths) > 1:
+                lines = chained_lines(file_paths)
+            else:
+                lines = my_file
+            if args.breakdown:
+                if args.workers > 1:
+                    breakdowns = access_breakdowns_parallel(file_path, ACCESS_LOG_TIMEFMT,
+                                                            args.top, args.workers,
+                                                            args.clients)
+                else:
+                    breakdowns = access_breakdowns(lines, ACCESS_LOG_TIMEFMT, args.top,
+                                                   args.clients)
+                print_breakdowns(*breakdowns, args.top)
+            elif widths:
+                unique_widths = sorted(set(widths.values()))
+                if args.workers > 1:
+                    rollups = access_rollups_parallel(file_path, ACCESS_LOG_TIMEFMT,
+                                                      unique_widths, args.workers,
+                                                      args.clients)
+                else:
+                    # buckets do not depend on line order, so no merge is needed
+                    rollups = access_rollups(lines, ACCESS_LOG_TIMEFMT, unique_widths,
+                                             args.clients)
+                for name, width in widths.items():
+                    print(f"\nAccesses per {name}\n")
+                    print_counts(rollup_rows(*rollups[width], width=width),
+                                 day_breaks=width < GRANULARITIES["day"])
+            else:
+                if args.follow:
+                    counts = access_counts_by_hour(follow_lines(file_path),
+                                                   ACCESS_LOG_TIMEFMT, args.clients)
+                elif args.workers > 1:
+                    counts = access_counts_parallel(file_path, ACCESS_LOG_TIMEFMT,
+                                                    args.workers, args.clients)
+                elif merging and not windowed:
+                    counts = access_counts_by_hour(
+                        merged_lines(file_paths, ACCESS_LOG_TIMEFMT, window),
+                        ACCESS_LOG_TIMEFMT, args.clients)
+                else:
+                    counts = access_counts_by_hour(lines, ACCESS_LOG_TIMEFMT, args.clients)
+                print_counts(counts)
+        names = ", ".join(f'"{name}"' for name in file_paths)
+        label = "Names of files" if len(file_paths) > 1 else "Name of file"
+        print(f"\n{label} read: {names}\n")
+
+    except KeyboardInterrupt:
+        print(f'\nStopped following "{file_path}"\n')
 
     except (FileNotFoundError, PermissionError) as err:
         print(
-            f"\nFile \"{file_path}\" not found.\n"
+            f"\nFile \"{err.filename}\" not found.\n"
             if isinstance(err, FileNotFoundError)
-            else f"No read permission for file \"{file_path}\"\n"
+            else f"No read permission for file \"{err.filename}\"\n"
         )
 
 